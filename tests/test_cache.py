@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import time
+from unittest import mock
+
+import pytest
+
+from tsbot import cache, response
+
+GROUPS_QUERY = "servergroupsbyclientid cldbid=2"
+
+
+def create_response(**data: str) -> response.TSResponse:
+    return response.TSResponse(data=(data,), error_id=0, msg="ok")
+
+
+@pytest.fixture
+def response_cache():
+    return cache.ResponseCache()
+
+
+def test_cache_hit(response_cache: cache.ResponseCache):
+    resp = create_response(sgid="6")
+    response_cache.put(GROUPS_QUERY, resp)
+
+    assert response_cache.get(GROUPS_QUERY) is resp
+    assert response_cache.stats == cache.CacheStats(size=1, hits=1, misses=0)
+
+
+def test_uncached_command(response_cache: cache.ResponseCache):
+    response_cache.put("clientpoke clid=2 msg=hi", create_response())
+
+    assert response_cache.get("clientpoke clid=2 msg=hi") is None
+    assert response_cache.stats == cache.CacheStats(size=0, hits=0, misses=0)
+
+
+def test_cache_expires(monkeypatch: pytest.MonkeyPatch):
+    response_cache = cache.ResponseCache(ttls={"servergroupsbyclientid": 10})
+    response_cache.put(GROUPS_QUERY, create_response())
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", mock.Mock(return_value=now + 11))
+
+    assert response_cache.get(GROUPS_QUERY) is None
+    assert not response_cache
+
+
+def test_least_recently_used_evicted():
+    response_cache = cache.ResponseCache(max_size=2)
+
+    response_cache.put("servergroupsbyclientid cldbid=1", create_response())
+    response_cache.put("servergroupsbyclientid cldbid=2", create_response())
+    response_cache.get("servergroupsbyclientid cldbid=1")
+    response_cache.put("servergroupsbyclientid cldbid=3", create_response())
+
+    assert response_cache.get("servergroupsbyclientid cldbid=1")
+    assert response_cache.get("servergroupsbyclientid cldbid=2") is None
+
+
+@pytest.mark.parametrize(
+    ("method", "argument"),
+    (
+        pytest.param("invalidate_after_event", "clientmoved", id="test_invalidate_on_event"),
+        pytest.param(
+            "invalidate_after_query",
+            "servergroupaddclient sgid=6 cldbid=2",
+            id="test_invalidate_on_query",
+        ),
+        pytest.param("invalidate_after_event", "disconnect", id="test_clear_on_disconnect"),
+    ),
+)
+def test_invalidation(response_cache: cache.ResponseCache, method: str, argument: str):
+    response_cache.put(GROUPS_QUERY, create_response())
+    getattr(response_cache, method)(argument)
+
+    assert response_cache.get(GROUPS_QUERY) is None
+
+
+def test_unrelated_event_keeps_cache(response_cache: cache.ResponseCache):
+    response_cache.put(GROUPS_QUERY, create_response())
+    response_cache.invalidate_after_event("textmessage")
+
+    assert response_cache.get(GROUPS_QUERY)
+
+
+def test_stale_response_not_cached(response_cache: cache.ResponseCache):
+    generation = response_cache.generation
+    response_cache.invalidate_after_event("clientmoved")
+    response_cache.put(GROUPS_QUERY, create_response(), generation)
+
+    assert response_cache.get(GROUPS_QUERY) is None
+
+
+def test_compact_cache_stores_compact_responses():
+    response_cache = cache.ResponseCache(compact=True)
+    response_cache.put(GROUPS_QUERY, create_response(sgid="6", name="Guest"))
+
+    cached = response_cache.get(GROUPS_QUERY)
+
+    assert isinstance(cached, response.CompactTSResponse)
+    assert cached.first == {"sgid": "6", "name": "Guest"}
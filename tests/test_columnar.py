@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytest
+
+from tsbot import columnar, response
+
+CLIENTLIST = response.TSResponse.from_server_response(
+    [
+        "clid=1 cid=1 client_idle_time=100"
+        "|clid=2 cid=3 client_idle_time=5000 client_away_message=brb"
+        "|clid=5 cid=1 client_idle_time=90000",
+        "error id=0 msg=ok",
+    ]
+)
+
+
+@pytest.fixture
+def columns():
+    return CLIENTLIST.columns()
+
+
+def test_columns_in_row_order(columns: columnar.TSColumns):
+    assert list(columns) == ["clid", "cid", "client_idle_time", "client_away_message"]
+    assert columns["clid"] == ["1", "2", "5"]
+    assert columns.row_count == 3
+
+
+def test_missing_values_are_empty(columns: columnar.TSColumns):
+    assert columns["client_away_message"] == ["", "brb", ""]
+
+
+def test_unknown_column_raises(columns: columnar.TSColumns):
+    with pytest.raises(KeyError):
+        columns["client_nickname"]
+
+
+def test_ints_and_select(columns: columnar.TSColumns):
+    idle_times, cids = columns.ints("client_idle_time"), columns.ints("cid")
+
+    assert list(idle_times) == [100, 5000, 90000]
+    assert columns.select(t > 1000 and c != 3 for t, c in zip(idle_times, cids)) == [
+        CLIENTLIST.data[2]
+    ]
+
+
+def test_numpy_select(columns: columnar.TSColumns):
+    pytest.importorskip("numpy")
+
+    mask = (columns.numpy("client_idle_time") > 1000) & (columns.numpy("cid") != 3)
+    assert columns.select(mask) == [CLIENTLIST.data[2]]
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Sequence
+
+import pytest
+import pytest_asyncio
+from typing_extensions import override
+
+from tsbot import events, exceptions, response
+from tsbot.connection import connection
+from tsbot.connection.connection_types import abc
+
+
+class FakeConnection(abc.Connection):
+    """Connection to a fake server answering queries with `responder`."""
+
+    def __init__(self, responder: Callable[[str], Sequence[str]]) -> None:
+        self.responder = responder
+        self.written: list[str] = []
+
+        self._lines: asyncio.Queue[str | None] = asyncio.Queue()
+        self._closed = asyncio.Event()
+
+    @override
+    async def connect(self) -> None:
+        self._closed.clear()
+
+    @override
+    async def validate_header(self) -> None:
+        pass
+
+    @override
+    async def authenticate(self) -> None:
+        pass
+
+    @override
+    def close(self) -> None:
+        self._lines.put_nowait(None)
+        self._closed.set()
+
+    @override
+    async def wait_closed(self) -> None:
+        await self._closed.wait()
+
+    @override
+    async def write(self, data: str) -> None:
+        self.written.append(data)
+
+        for line in self.responder(data):
+            self._lines.put_nowait(f"{line}{self.LINE_ENDING}")
+
+    @override
+    async def readline(self) -> str | None:
+        return await self._lines.get()
+
+
+def respond_ok(raw_query: str) -> Sequence[str]:
+    if raw_query.startswith("bad"):
+        return ("error id=256 msg=command\\snot\\sfound",)
+
+    if raw_query.startswith("clientinfo"):
+        clid = raw_query.partition("=")[2]
+        return (f"client_nickname=client{clid}", "error id=0 msg=ok")
+
+    return ("error id=0 msg=ok",)
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def ts_connection() -> AsyncGenerator[connection.TSConnection, None]:
+    fake = FakeConnection(respond_ok)
+    connected = asyncio.Event()
+
+    def emitter(event: events.TSEvent) -> None:
+        if event.event == "connect":
+            connected.set()
+
+    ts_connection = connection.TSConnection(emitter, fake, pipelined=True)
+
+    ts_connection.connect()
+    await asyncio.wait_for(connected.wait(), timeout=1)
+
+    yield ts_connection
+
+    ts_connection.close()
+    await ts_connection.wait_closed()
+
+
+# pyright: reportPrivateUsage=false
+
+
+@pytest.mark.parametrize(
+    ("raw_response", "expected_wait"),
+    (
+        pytest.param(
+            "error id=524 msg=client\\sis\\sflooding extra_msg=please\\swait\\s2\\sseconds",
+            2,
+            id="test_flood_wait",
+        ),
+        pytest.param(
+            "error id=524 msg=client\\sis\\sflooding",
+            connection.DEFAULT_FLOOD_WAIT,
+            id="test_flood_wait_default",
+        ),
+    ),
+)
+def test_flood_wait(raw_response: str, expected_wait: float):
+    flood_response = response.TSResponse.from_server_response((raw_response,))
+    assert connection._flood_wait(flood_response) == expected_wait
+
+
+@pytest.mark.asyncio
+async def test_send_many_results_in_order(ts_connection: connection.TSConnection):
+    raw_queries = ["clientinfo clid=1", "bad", "clientinfo clid=2"]
+
+    results = [result async for result in ts_connection.send_many_raw(raw_queries)]
+
+    assert isinstance(results[0], response.TSResponse)
+    assert results[0]["client_nickname"] == "client1"
+    assert isinstance(results[1], exceptions.TSResponseError)
+    assert results[1].error_id == 256
+    assert isinstance(results[2], response.TSResponse)
+    assert results[2]["client_nickname"] == "client2"
+
+
+@pytest.mark.asyncio
+async def test_send_many_stopped_early(ts_connection: connection.TSConnection):
+    results = ts_connection.send_many_raw(f"clientinfo clid={i}" for i in range(10))
+
+    async for _ in results:
+        break
+    await results.aclose()
+
+    resp = await ts_connection.send_raw("clientinfo clid=20")
+    assert resp["client_nickname"] == "client20"
+
+
+@pytest.mark.asyncio
+async def test_notification_classes_synced(ts_connection: connection.TSConnection):
+    fake = ts_connection._connection
+    assert isinstance(fake, FakeConnection)
+    assert "servernotifyregister event=channel id=0" in fake.written
+
+    fake.written.clear()
+    ts_connection.set_notification_classes({"textprivate"})
+    await asyncio.sleep(0.01)
+
+    assert fake.written == ["servernotifyunregister", "servernotifyregister event=textprivate"]
+
+    fake.written.clear()
+    ts_connection.set_notification_classes({"textprivate", "server"})
+    await asyncio.sleep(0.01)
+
+    assert fake.written == ["servernotifyregister event=server"]
+
+
+@pytest.mark.asyncio
+async def test_notification_classes_set_after_sync_not_lost(
+    ts_connection: connection.TSConnection,
+):
+    fake = ts_connection._connection
+    assert isinstance(fake, FakeConnection)
+
+    ts_connection.set_notification_classes({"textprivate"})
+    task = ts_connection._notification_task
+    assert task
+
+    while not task.done():
+        await asyncio.sleep(0)
+
+    fake.written.clear()
+    ts_connection.set_notification_classes({"textprivate", "server"})
+    await asyncio.sleep(0.01)
+
+    assert fake.written == ["servernotifyregister event=server"]
+
+
+FLOOD_RESPONSE = "error id=524 msg=client\\sis\\sflooding extra_msg=please\\swait\\s0\\sseconds"
+
+
+def respond_flood(raw_query: str) -> Sequence[str]:
+    if raw_query.startswith(("clientlist", "clientmove")):
+        return (FLOOD_RESPONSE,)
+
+    return respond_ok(raw_query)
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def flooded_connection() -> AsyncGenerator[
+    tuple[connection.TSConnection, list[events.TSEvent]], None
+]:
+    fake = FakeConnection(respond_flood)
+    connected = asyncio.Event()
+    emitted: list[events.TSEvent] = []
+
+    def emitter(event: events.TSEvent) -> None:
+        emitted.append(event)
+        if event.event == "connect":
+            connected.set()
+
+    ts_connection = connection.TSConnection(emitter, fake, flood_retries=2)
+
+    ts_connection.connect()
+    await asyncio.wait_for(connected.wait(), timeout=1)
+
+    yield ts_connection, emitted
+
+    ts_connection.close()
+    await ts_connection.wait_closed()
+
+
+@pytest.mark.parametrize(
+    ("raw_query", "idempotent", "expected_attempts"),
+    (
+        pytest.param("clientlist", None, 3, id="test_read_only_retried"),
+        pytest.param("clientmove clid=1 cid=2", None, 1, id="test_state_changing_not_retried"),
+        pytest.param("clientmove clid=1 cid=2", True, 3, id="test_idempotent_retried"),
+        pytest.param("clientlist", False, 1, id="test_not_idempotent_not_retried"),
+    ),
+)
+@pytest.mark.asyncio
+async def test_flood_retries(
+    flooded_connection: tuple[connection.TSConnection, list[events.TSEvent]],
+    raw_query: str,
+    idempotent: bool | None,
+    expected_attempts: int,
+):
+    ts_connection, emitted = flooded_connection
+    fake = ts_connection._connection
+    assert isinstance(fake, FakeConnection)
+
+    with pytest.raises(exceptions.TSResponseFloodError):
+        await asyncio.wait_for(ts_connection.send_raw(raw_query, idempotent=idempotent), timeout=1)
+
+    assert fake.written.count(raw_query) == expected_attempts
+
+    floods = [event.ctx for event in emitted if event.event == "flood"]
+    assert len(floods) == expected_attempts
+    assert all(ctx["query"] == raw_query and ctx["wait"] == "0.0" for ctx in floods)
+
+
+@pytest.mark.asyncio
+async def test_flood_retry_returns_response(
+    flooded_connection: tuple[connection.TSConnection, list[events.TSEvent]],
+):
+    ts_connection, emitted = flooded_connection
+    fake = ts_connection._connection
+    assert isinstance(fake, FakeConnection)
+
+    responses = iter(((FLOOD_RESPONSE,), ("client_nickname=client1", "error id=0 msg=ok")))
+
+    def respond(raw_query: str) -> Sequence[str]:
+        return next(responses)
+
+    fake.responder = respond
+
+    resp = await asyncio.wait_for(ts_connection.send_raw("clientinfo clid=1"), timeout=1)
+
+    assert resp["client_nickname"] == "client1"
+    assert fake.written.count("clientinfo clid=1") == 2
+    assert [event.event for event in emitted].count("flood") == 1
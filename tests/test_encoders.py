@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import os
+import timeit
+from collections.abc import Callable, Sequence
+
 import pytest
 
 from tsbot import encoders
@@ -23,3 +27,89 @@ def test_escape(input_str: str, expected: str) -> None:
 @pytest.mark.parametrize(("expected", "input_str"), escape_params)
 def test_unescape(input_str: str, expected: str) -> None:
     assert encoders.unescape(input_str) == expected
+
+
+@pytest.mark.parametrize(
+    ("input_str", "expected"),
+    (
+        pytest.param(r"C:\\server\\logs", r"C:\server\logs", id="test_backslashes"),
+        pytest.param(r"\\s", r"\s", id="test_escaped_backslash_before_s"),
+        pytest.param(r"\\\s", "\\ ", id="test_escaped_backslash_and_space"),
+        pytest.param(r"https:\/\/teamspeak.com", "https://teamspeak.com", id="test_slashes"),
+        pytest.param(r"unknown\xescape", r"unknown\xescape", id="test_unknown_escape"),
+    ),
+)
+def test_unescape_escaped_backslashes(input_str: str, expected: str) -> None:
+    assert encoders.unescape(input_str) == expected
+    assert encoders.unescape(encoders.escape(expected)) == expected
+
+
+def _chained_escape(input_str: str) -> str:
+    """The previous implementation, one replace per escape sequence."""
+    for char, replacement in encoders.ESCAPE_MAP:
+        input_str = input_str.replace(char, replacement)
+    return input_str
+
+
+def _chained_unescape(input_str: str) -> str:
+    """The previous implementation, one replace per escape sequence."""
+    for replacement, char in encoders.ESCAPE_MAP:
+        input_str = input_str.replace(char, replacement)
+    return input_str
+
+
+ESCAPED_VALUES = (
+    r"Player\s12",
+    r"xX\sSniper\p\sPro\sXx",
+    r"TeamSpeak\s]I[\sServer\s\p\sEU\/West\s#1",
+    r"[cspacer]\s-\sGaming\s\/\sChill\s-",
+    r"Welcome\sto\sthe\sserver!\sRead\sthe\srules\sat\shttps:\/\/example.com\/rules",
+)
+
+CLIENTLIST_ROW = (
+    "clid={clid} cid=1 client_database_id={clid} client_nickname=Player\\s{clid}"
+    " client_type=0 client_unique_identifier=w2B8lDMG6N4ak7FQiRFh0Vmh+9Q="
+    " client_servergroups=6,8 client_away=0 client_away_message client_idle_time=1520"
+    " client_country=FI connection_client_ip=192.168.1.{clid}"
+)
+
+
+benchmark = pytest.mark.skipif(
+    not os.environ.get("TSBOT_BENCHMARK"), reason="Benchmarks are ran with TSBOT_BENCHMARK=1"
+)
+
+CLIENTLIST_VALUES = [
+    value
+    for clid in range(20)
+    for _, _, value in (v.partition("=") for v in CLIENTLIST_ROW.format(clid=clid).split())
+]
+
+
+def _run(func: Callable[[str], str], values: Sequence[str]) -> float:
+    return min(timeit.repeat(lambda: [func(v) for v in values], number=200, repeat=5))
+
+
+def test_same_results_as_chained_replace() -> None:
+    for value in (*ESCAPED_VALUES, *CLIENTLIST_VALUES):
+        assert encoders.unescape(value) == _chained_unescape(value)
+
+        unescaped = _chained_unescape(value)
+        assert encoders.escape(unescaped) == _chained_escape(unescaped)
+
+
+@benchmark
+@pytest.mark.parametrize(
+    "values",
+    (
+        pytest.param(ESCAPED_VALUES, id="test_escaped_values"),
+        pytest.param(CLIENTLIST_VALUES, id="test_clientlist_values"),
+    ),
+)
+def test_unescape_faster_than_chained_replace(values: Sequence[str]) -> None:
+    assert _run(encoders.unescape, values) < _run(_chained_unescape, values)
+
+
+@benchmark
+def test_escape_faster_than_chained_replace() -> None:
+    values = [_chained_unescape(v) for v in ESCAPED_VALUES]
+    assert _run(encoders.escape, values) < _run(_chained_escape, values)
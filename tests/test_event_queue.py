@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tsbot import events
+
+
+def moved(clid: str) -> events.TSEvent:
+    return events.TSEvent.from_server_notification(
+        f"notifyclientmoved ctid=2 reasonid=0 clid={clid}"
+    )
+
+
+def clids(queue: events.EventQueue) -> list[str]:
+    return [event.ctx["clid"] for event in queue]
+
+
+@pytest.mark.asyncio
+async def test_unbounded_queue_keeps_every_event():
+    queue = events.EventQueue()
+
+    for clid in range(100):
+        queue.put_nowait(moved(str(clid)))
+
+    assert queue.stats == events.EventQueueStats(queued=100, dropped=0, coalesced=0)
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    (
+        pytest.param(events.DropOldest(), ["2", "3", "4"], id="test_drop_oldest"),
+        pytest.param(events.DropNewest(), ["0", "1", "2"], id="test_drop_newest"),
+    ),
+)
+@pytest.mark.asyncio
+async def test_drop_policies(policy: events.OverflowPolicy, expected: list[str]):
+    queue = events.EventQueue(maxsize=3, overflow_policy=policy)
+
+    for clid in range(5):
+        queue.put_nowait(moved(str(clid)))
+
+    assert clids(queue) == expected
+    assert queue.stats == events.EventQueueStats(queued=3, dropped=2, coalesced=0)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_replaces_event_with_same_key():
+    queue = events.EventQueue(
+        maxsize=2,
+        overflow_policy=events.Coalesce(key=lambda e: e.ctx["clid"], fallback=events.DropNewest()),
+    )
+
+    for clid in ("1", "2", "1", "3"):
+        queue.put_nowait(moved(clid))
+
+    assert clids(queue) == ["1", "2"]
+    assert queue.stats == events.EventQueueStats(queued=2, dropped=1, coalesced=1)
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_events_never_dropped():
+    queue = events.EventQueue(maxsize=1, overflow_policy=events.DropNewest())
+
+    queue.put_nowait(events.TSEvent("connect"))
+    queue.put_nowait(moved("1"))
+    queue.put_nowait(events.TSEvent("disconnect"))
+
+    assert [event.event for event in queue] == ["connect", "disconnect"]
+
+
+@pytest.mark.asyncio
+async def test_dropped_events_dont_block_join():
+    queue = events.EventQueue(maxsize=1)
+
+    queue.put_nowait(moved("1"))
+    queue.put_nowait(moved("2"))
+
+    await queue.get()
+    queue.task_done()
+
+    await asyncio.wait_for(queue.join(), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_block_clears_not_full():
+    queue = events.EventQueue(maxsize=2, overflow_policy=events.Block())
+
+    for clid in range(3):
+        queue.put_nowait(moved(str(clid)))
+
+    assert queue.qsize() == 3
+    assert not queue.not_full.is_set()
+
+    await queue.get()
+    assert not queue.not_full.is_set()
+
+    await queue.get()
+    assert queue.not_full.is_set()
+
+
+@pytest.mark.asyncio
+async def test_every_waiting_getter_gets_an_event():
+    queue = events.EventQueue()
+
+    getters = [asyncio.create_task(queue.get()) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    for clid in range(3):
+        queue.put_nowait(moved(str(clid)))
+
+    got = await asyncio.wait_for(asyncio.gather(*getters), timeout=1)
+    assert [event.ctx["clid"] for event in got] == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_getter_passes_event_on():
+    queue = events.EventQueue()
+
+    cancelled = asyncio.create_task(queue.get())
+    waiting = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+
+    queue.put_nowait(moved("1"))
+    cancelled.cancel()
+
+    event = await asyncio.wait_for(waiting, timeout=1)
+    assert event.ctx["clid"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_coalesce_doesnt_scan_queue():
+    key_calls = 0
+
+    def key(event: events.TSEvent) -> str:
+        nonlocal key_calls
+        key_calls += 1
+        return event.ctx["clid"]
+
+    queue = events.EventQueue(maxsize=100, overflow_policy=events.Coalesce(key=key))
+
+    for clid in range(100):
+        queue.put_nowait(moved(str(clid)))
+    for clid in range(100):
+        queue.put_nowait(moved(str(clid)))
+
+    # A few key calls per event, instead of one per queued event
+    assert key_calls <= 4 * 200
+    assert queue.stats == events.EventQueueStats(queued=100, dropped=0, coalesced=100)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_index_follows_queue():
+    queue = events.EventQueue(
+        maxsize=2,
+        overflow_policy=events.Coalesce(key=lambda e: e.ctx["clid"], fallback=events.DropNewest()),
+    )
+
+    queue.put_nowait(moved("1"))
+    queue.put_nowait(moved("2"))
+    assert queue.get_nowait().ctx["clid"] == "1"
+
+    queue.put_nowait(moved("3"))
+    queue.put_nowait(moved("1"))
+    queue.put_nowait(moved("3"))
+
+    assert clids(queue) == ["2", "3"]
+    assert queue.stats == events.EventQueueStats(queued=2, dropped=1, coalesced=1)
+
+    queue.drop(next(iter(queue)))
+    queue.put_nowait(moved("4"))
+    queue.put_nowait(moved("2"))
+
+    assert clids(queue) == ["3", "4"]
+    assert queue.stats == events.EventQueueStats(queued=2, dropped=3, coalesced=1)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from tsbot import events, parsers
+from tsbot.events import event_types
+
+# pyright: reportPrivateUsage=false
+
+NOTIFICATION = "notifyclientmoved ctid=2 reasonid=0 clid=5"
+
+
+def test_notification_parsed_on_access(monkeypatch: pytest.MonkeyPatch):
+    parse_line = mock.Mock(wraps=parsers.parse_line)
+    monkeypatch.setattr(parsers, "parse_line", parse_line)
+
+    event = events.TSEvent.from_server_notification(NOTIFICATION)
+    assert event.event == "clientmoved"
+    parse_line.assert_not_called()
+
+    assert event.ctx["clid"] == "5"
+    assert dict(event.ctx) == {"ctid": "2", "reasonid": "0", "clid": "5"}
+    parse_line.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_event_without_handlers_dropped():
+    event_manager = events.EventManager()
+    event_manager._running.set()
+
+    event_manager.add_event(events.TSEvent.from_server_notification(NOTIFICATION))
+    assert event_manager._event_queue.empty()
+
+    event_manager.register_event_handler(events.TSEventHandler("clientmoved", mock.AsyncMock()))
+    event_manager.add_event(events.TSEvent.from_server_notification(NOTIFICATION))
+    assert event_manager._event_queue.qsize() == 1
+
+
+@pytest.mark.parametrize(
+    ("handled_events", "expected_classes"),
+    (
+        pytest.param({"textmessage"}, {"textserver", "textchannel", "textprivate"}, id="test_text"),
+        pytest.param({"clientmoved", "connect"}, {"channel"}, id="test_channel"),
+        pytest.param({"cliententerview", "tokenused"}, {"server", "tokenused"}, id="test_server"),
+        pytest.param({"connect", "custom_event"}, set[str](), id="test_no_notifications"),
+    ),
+)
+def test_notification_classes(handled_events: set[str], expected_classes: set[str]):
+    assert event_types.notification_classes(handled_events) == expected_classes
+
+
+@pytest.mark.asyncio
+async def test_coalescing_handler_runs_with_newest_event_per_key():
+    handler = mock.AsyncMock()
+    event_handler = events.TSEventCoalescingHandler("clientmoved", handler, "clid", 0.01)
+    bot = mock.Mock()
+
+    notifications = ("clid=1 ctid=2", "clid=2 ctid=2", "clid=1 ctid=3", "clid=1 ctid=4")
+    await asyncio.gather(
+        *(
+            event_handler.run(
+                bot, events.TSEvent.from_server_notification(f"notifyclientmoved {n}")
+            )
+            for n in notifications
+        )
+    )
+    await asyncio.sleep(0.02)
+    await asyncio.wait_for(asyncio.gather(*event_handler._flushes), timeout=1)
+
+    assert sorted((c.args[1]["clid"], c.args[1]["ctid"]) for c in handler.await_args_list) == [
+        ("1", "4"),
+        ("2", "2"),
+    ]
+    assert not event_handler._pending
+
+
+@pytest.mark.asyncio
+async def test_coalescing_handler_doesnt_wait_window():
+    handler = mock.AsyncMock()
+    event_handler = events.TSEventCoalescingHandler("clientmoved", handler, "clid", 10)
+
+    event = events.TSEvent.from_server_notification("notifyclientmoved clid=1 ctid=2")
+    await asyncio.wait_for(event_handler.run(mock.Mock(), event), timeout=1)
+
+    handler.assert_not_awaited()
+    assert event_handler.pending
+
+    await asyncio.wait_for(event_handler.drain(mock.Mock()), timeout=1)
+    handler.assert_awaited_once()
+    assert not event_handler.pending
+
+
+@pytest.mark.asyncio
+async def test_run_till_empty_handles_coalesced_events():
+    event_manager = events.EventManager()
+    event_manager._running.set()
+
+    handler = mock.AsyncMock()
+    event_manager.register_event_handler(
+        events.TSEventCoalescingHandler("clientmoved", handler, "clid", 10)
+    )
+
+    event_manager.add_event(
+        events.TSEvent.from_server_notification("notifyclientmoved clid=1 ctid=2")
+    )
+    await asyncio.wait_for(event_manager.run_till_empty(mock.Mock()), timeout=1)
+
+    handler.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_coalescing_handler_runs_events_without_key():
+    handler = mock.AsyncMock()
+    event_handler = events.TSEventCoalescingHandler("custom", handler, lambda _: None, 10)
+
+    await asyncio.wait_for(event_handler.run(mock.Mock(), events.TSEvent("custom")), timeout=1)
+    handler.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_workers_bound_concurrency():
+    event_manager = events.EventManager(workers=2)
+    event_manager._running.set()
+
+    running = 0
+    most_running = 0
+
+    async def handler(bot: Any, ctx: None):
+        nonlocal running, most_running
+        running += 1
+        most_running = max(running, most_running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    event_manager.register_event_handler(events.TSEventHandler("custom", handler))
+    for _ in range(6):
+        event_manager.add_event(events.TSEvent("custom"))
+
+    await asyncio.wait_for(event_manager.run_till_empty(mock.Mock()), timeout=1)
+
+    assert most_running == 2
+    assert event_manager._event_queue.empty()
+    assert not event_manager._workers
+
+
+@pytest.mark.asyncio
+async def test_idle_workers_handle_events_concurrently():
+    event_manager = events.EventManager(workers=4)
+    event_manager._running.set()
+
+    running = 0
+    most_running = 0
+
+    async def handler(bot: Any, ctx: None):
+        nonlocal running, most_running
+        running += 1
+        most_running = max(running, most_running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    event_manager.register_event_handler(events.TSEventHandler("custom", handler))
+
+    # Let every worker wait on the empty queue before the events arrive
+    event_manager._start_workers(mock.Mock())
+    await asyncio.sleep(0)
+
+    for _ in range(4):
+        event_manager.add_event(events.TSEvent("custom"))
+
+    await asyncio.wait_for(event_manager.run_till_empty(mock.Mock()), timeout=1)
+
+    assert most_running == 4
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.timeout added in Python 3.11")
+@pytest.mark.asyncio
+async def test_eager_handler_timeout_doesnt_cancel_worker():
+    event_manager = events.EventManager(workers=1)
+    event_manager._running.set()
+
+    async def times_out(bot: Any, ctx: None):
+        async with asyncio.timeout(0.01):
+            await asyncio.sleep(1)
+
+    handler = mock.AsyncMock()
+    event_manager.register_event_handler(events.TSEventHandler("custom", times_out, eager=True))
+    event_manager.register_event_handler(events.TSEventHandler("custom", handler))
+
+    event_manager.add_event(events.TSEvent("custom"))
+    event_manager.add_event(events.TSEvent("custom"))
+    await asyncio.wait_for(event_manager.run_till_empty(mock.Mock()), timeout=1)
+
+    assert handler.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_handler_exception_doesnt_stop_worker():
+    event_manager = events.EventManager(workers=1)
+    event_manager._running.set()
+
+    failing = mock.AsyncMock(side_effect=RuntimeError)
+    handler = mock.AsyncMock()
+    event_manager.register_event_handler(events.TSEventHandler("custom", failing))
+    event_manager.register_event_handler(events.TSEventHandler("custom", handler))
+
+    event_manager.add_event(events.TSEvent("custom"))
+    event_manager.add_event(events.TSEvent("custom"))
+    await asyncio.wait_for(event_manager.run_till_empty(mock.Mock()), timeout=1)
+
+    assert failing.await_count == 2
+    assert handler.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_eager_handler_runs_before_scheduled_handlers():
+    event_manager = events.EventManager()
+    order: list[str] = []
+
+    async def scheduled(bot: Any, ctx: None):
+        order.append("scheduled")
+
+    async def eager(bot: Any, ctx: None):
+        order.append("eager")
+
+    event_manager.register_event_handler(events.TSEventHandler("custom", scheduled))
+    event_manager.register_event_handler(events.TSEventHandler("custom", eager, eager=True))
+
+    await event_manager.handle_event(mock.Mock(), events.TSEvent("custom"))
+    assert order == ["eager", "scheduled"]
+
+
+@pytest.mark.parametrize(
+    ("notification", "expected"),
+    (
+        pytest.param("notifyclientmoved ctid=2 clid=5", {"any", "lobby", "clid5"}, id="test_match"),
+        pytest.param("notifyclientmoved ctid=3 clid=5", {"any", "clid5"}, id="test_other_channel"),
+        pytest.param("notifyclientmoved ctid=2 clid=6", {"any", "lobby"}, id="test_other_client"),
+    ),
+)
+@pytest.mark.asyncio
+async def test_filtered_handlers(notification: str, expected: set[str]):
+    event_manager = events.EventManager()
+    called: set[str] = set()
+
+    def handler(name: str):
+        async def inner(bot: Any, ctx: Any):
+            called.add(name)
+
+        return inner
+
+    for name, filters in (("any", None), ("lobby", {"ctid": "2"}), ("other", {"ctid": "9"})):
+        event_manager.register_event_handler(
+            events.TSEventHandler("clientmoved", handler(name), filters=filters)
+        )
+    event_manager.register_event_handler(
+        events.TSEventHandler(
+            "clientmoved", handler("clid5"), predicate=lambda ctx: ctx["clid"] == "5"
+        )
+    )
+
+    await event_manager.handle_event(
+        mock.Mock(), events.TSEvent.from_server_notification(notification)
+    )
+    assert called == expected
+
+
+def test_filtered_handler_removed_from_index():
+    event_manager = events.EventManager()
+    event_handler = events.TSEventHandler(
+        "clientmoved", mock.AsyncMock(), filters={"ctid": "2", "clid": "5"}
+    )
+
+    event_manager.register_event_handler(event_handler)
+    assert event_manager.handled_events == {"clientmoved"}
+
+    event_manager.remove_event_handler(event_handler)
+    assert event_manager.handled_events == set()
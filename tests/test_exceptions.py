@@ -19,3 +19,11 @@ def test_ts_response_error(error_id: int, message: str):
     assert error.msg == message
 
     assert str(error)
+
+
+def test_ts_response_flood_error():
+    error = exceptions.TSResponseFloodError("client is flooding", 524, retry_after=5)
+
+    assert isinstance(error, exceptions.TSResponseError)
+    assert error.retry_after == 5
+    assert "5" in str(error)
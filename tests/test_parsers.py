@@ -275,3 +275,10 @@ def test_parse_args_kwargs(
 )
 def test_split_ensure_splits(input_str: str, maxsplit: int, expected: tuple[str, ...]):
     assert parsers.split_ensure_splits(input_str, maxsplit=maxsplit) == expected
+
+
+def test_parse_data_shares_keys() -> None:
+    first, second = parsers.parse_data("clid=1 cid=2|clid=3 cid=4")
+
+    for a, b in zip(first, second):
+        assert a is b
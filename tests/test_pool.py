@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncGenerator, Sequence
+from unittest import mock
+
+import pytest
+import pytest_asyncio
+
+from tests.test_connection import FakeConnection, respond_ok
+from tsbot import events
+from tsbot.bot import TSBot
+from tsbot.connection import connection, pool
+
+
+def respond_or_hang(raw_query: str) -> Sequence[str]:
+    """Leave `clientlist` queries without a response, so they stay in flight."""
+    if raw_query.startswith("clientlist"):
+        return ()
+
+    return respond_ok(raw_query)
+
+
+async def create_session() -> connection.TSConnection:
+    connected = asyncio.Event()
+
+    def emitter(event: events.TSEvent) -> None:
+        if event.event == "connect":
+            connected.set()
+
+    session = connection.TSConnection(emitter, FakeConnection(respond_or_hang), pipelined=True)
+    session.connect()
+    await asyncio.wait_for(connected.wait(), timeout=1)
+
+    return session
+
+
+def written(session: connection.TSConnection) -> list[str]:
+    fake = session._connection
+    assert isinstance(fake, FakeConnection)
+    return fake.written
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def sessions() -> AsyncGenerator[list[connection.TSConnection], None]:
+    sessions = [await create_session() for _ in range(3)]
+
+    yield sessions
+
+    for session in sessions:
+        session.close()
+        await session.wait_closed()
+
+
+# pyright: reportPrivateUsage=false
+
+
+def make_pool(sessions: list[connection.TSConnection]) -> pool.TSConnectionPool:
+    primary, *secondaries = sessions
+    return pool.TSConnectionPool(primary, secondaries)
+
+
+@pytest.mark.asyncio
+async def test_read_only_queries_balanced_by_in_flight(sessions: list[connection.TSConnection]):
+    connection_pool = make_pool(sessions)
+
+    pending = [asyncio.create_task(connection_pool.send_raw("clientlist")) for _ in range(3)]
+    await asyncio.sleep(0.01)
+
+    try:
+        assert [written(s).count("clientlist") for s in sessions] == [1, 1, 1]
+        assert all(connection_pool._in_flight[s] == 1 for s in sessions)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_state_changing_queries_sent_to_primary(sessions: list[connection.TSConnection]):
+    connection_pool = make_pool(sessions)
+
+    await asyncio.wait_for(connection_pool.send_raw("clientmove clid=1 cid=2"), timeout=1)
+
+    assert "clientmove clid=1 cid=2" in written(sessions[0])
+    assert all("clientmove clid=1 cid=2" not in written(s) for s in sessions[1:])
+
+
+@pytest.mark.asyncio
+async def test_failed_secondary_falls_back_to_primary(sessions: list[connection.TSConnection]):
+    primary, *secondaries = sessions
+    connection_pool = pool.TSConnectionPool(primary, secondaries[:1])
+
+    with mock.patch.object(secondaries[0], "send_raw", side_effect=ConnectionError):
+        resp = await asyncio.wait_for(connection_pool.send_raw("clientinfo clid=3"), timeout=1)
+
+    assert resp["client_nickname"] == "client3"
+    assert "clientinfo clid=3" in written(primary)
+    assert not connection_pool._in_flight[secondaries[0]]
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_sent_to_idle_secondaries(sessions: list[connection.TSConnection]):
+    connection_pool = make_pool(sessions)
+    connection_pool.KEEP_ALIVE_INTERVAL = 0.01
+
+    connection_pool._keep_alive_task = asyncio.create_task(connection_pool._keep_alive())
+    await asyncio.sleep(0.05)
+    connection_pool._keep_alive_task.cancel()
+
+    assert connection_pool.KEEP_ALIVE_COMMAND not in written(sessions[0])
+    assert all(connection_pool.KEEP_ALIVE_COMMAND in written(s) for s in sessions[1:])
+
+
+@pytest.mark.asyncio
+async def test_wait_closed_closes_secondaries(sessions: list[connection.TSConnection]):
+    connection_pool = make_pool(sessions)
+
+    sessions[0].close()
+    await asyncio.wait_for(connection_pool.wait_closed(), timeout=1)
+
+    assert not any(s.connected for s in sessions)
+
+
+def test_bot_needs_query_session():
+    with pytest.raises(ValueError):
+        TSBot("serveradmin", "password", "localhost", query_sessions=0)
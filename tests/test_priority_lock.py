@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tsbot import enums
+from tsbot.connection import priority_lock
+
+INTERACTIVE = enums.QueryPriority.INTERACTIVE
+NORMAL = enums.QueryPriority.NORMAL
+BULK = enums.QueryPriority.BULK
+
+
+async def acquire_all(
+    lock: priority_lock.PriorityLock, priorities: list[enums.QueryPriority]
+) -> list[int]:
+    """Queue waiters on a held lock and return the order they got the lock in."""
+    order: list[int] = []
+
+    async def waiter(index: int, priority: enums.QueryPriority):
+        async with lock(priority):
+            order.append(index)
+
+    await lock.acquire()
+    tasks = [asyncio.create_task(waiter(i, p)) for i, p in enumerate(priorities)]
+    await asyncio.sleep(0)
+
+    lock.release()
+    await asyncio.gather(*tasks)
+
+    return order
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_first():
+    lock = priority_lock.PriorityLock()
+    order = await acquire_all(lock, [BULK, NORMAL, BULK, INTERACTIVE, NORMAL])
+
+    assert order == [3, 1, 4, 0, 2]
+    assert not lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_lower_priority_not_starved():
+    lock = priority_lock.PriorityLock(starvation_limit=2)
+    order = await acquire_all(lock, [BULK, *(INTERACTIVE,) * 5])
+
+    assert order.index(0) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped():
+    lock = priority_lock.PriorityLock()
+    await lock.acquire()
+
+    cancelled = asyncio.create_task(lock.acquire(INTERACTIVE))
+    waiting = asyncio.create_task(lock.acquire(BULK))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    lock.release()
+
+    await waiting
+    assert lock.locked()
+
+
+@pytest.mark.asyncio
+async def test_release_unlocked():
+    lock = priority_lock.PriorityLock()
+
+    with pytest.raises(RuntimeError):
+        lock.release()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from unittest import mock
 
 import pytest
 
-from tsbot import ratelimiter
+from tsbot import connection, ratelimiter
+from tsbot.bot import TSBot
 
 # pyright: reportPrivateUsage=false
 
@@ -18,7 +20,7 @@ def default_rl():
 @pytest.mark.asyncio
 async def test_ratelimiter_call(default_rl: ratelimiter.RateLimiter):
     await default_rl.wait()
-    assert default_rl._calls == 1
+    assert default_rl.tokens == pytest.approx(9, abs=0.01)
 
 
 @pytest.mark.parametrize(
@@ -30,19 +32,26 @@ async def test_ratelimiter_call(default_rl: ratelimiter.RateLimiter):
 )
 @pytest.mark.asyncio
 async def test_ratelimiter_multiple_calls(
-    default_rl: ratelimiter.RateLimiter, number_of_calls: int
+    monkeypatch: pytest.MonkeyPatch, default_rl: ratelimiter.RateLimiter, number_of_calls: int
 ):
+    mock_sleep = mock.AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
     for _ in range(number_of_calls):
         await default_rl.wait()
 
-    assert default_rl._calls == number_of_calls
+    assert default_rl.tokens == pytest.approx(10 - number_of_calls, abs=0.01)
+    mock_sleep.assert_not_awaited()
 
 
 @pytest.mark.parametrize(
     ("rl", "number_of_calls"),
     (
         pytest.param(ratelimiter.RateLimiter(max_calls=5, period=1), 8, id="test_throttle"),
-        pytest.param(ratelimiter.RateLimiter(max_calls=10, period=1), 10, id="test_throttle_2"),
+        pytest.param(ratelimiter.RateLimiter(max_calls=10, period=1), 11, id="test_throttle_2"),
+        pytest.param(
+            ratelimiter.RateLimiter(max_calls=10, period=1, burst=1), 2, id="test_throttle_burst"
+        ),
     ),
 )
 @pytest.mark.asyncio
@@ -56,3 +65,117 @@ async def test_ratelimiter_throttle(
         await rl.wait()
 
     mock_sleep.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ratelimiter_sleeps_only_for_missing_tokens(monkeypatch: pytest.MonkeyPatch):
+    mock_sleep = mock.AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    rl = ratelimiter.RateLimiter(max_calls=10, period=1, burst=2)
+    await rl.wait(cost=3)
+
+    mock_sleep.assert_awaited_once_with(pytest.approx(0.1, abs=0.01))
+
+
+@pytest.mark.asyncio
+async def test_ratelimiter_waiters_are_spaced_in_order():
+    rl = ratelimiter.RateLimiter(max_calls=100, period=1, burst=1)
+    finished: list[tuple[int, float]] = []
+
+    async def waiter(index: int):
+        await rl.wait()
+        finished.append((index, time.monotonic()))
+
+    await asyncio.gather(*(waiter(i) for i in range(5)))
+
+    assert [index for index, _ in finished] == list(range(5))
+    assert finished[-1][1] - finished[0][1] >= 0.035
+    assert rl.stats.waiting == 0
+    assert rl.stats.total_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_returns_tokens():
+    rl = ratelimiter.RateLimiter(max_calls=1, period=10)
+    await rl.wait()
+
+    waiter = asyncio.create_task(rl.wait())
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert rl.stats.waiting == 0
+    assert rl._tat - time.monotonic() == pytest.approx(10, abs=0.1)
+
+
+@pytest.mark.parametrize(
+    ("raw_query", "expected_cost"),
+    (
+        pytest.param("clientpoke clid=1 msg=hello", 25, id="test_command_cost"),
+        pytest.param("clientlist -uid", 1, id="test_default_cost"),
+        pytest.param("version", 1, id="test_no_parameters"),
+    ),
+)
+def test_antiflood_cost(raw_query: str, expected_cost: float):
+    antiflood = ratelimiter.AntiFloodLimiter(command_costs={"clientpoke": 25})
+    assert antiflood.cost(raw_query) == expected_cost
+
+
+@pytest.mark.asyncio
+async def test_antiflood_not_limited_until_configured(monkeypatch: pytest.MonkeyPatch):
+    mock_sleep = mock.AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    antiflood = ratelimiter.AntiFloodLimiter(default_cost=1000)
+    await antiflood.wait("clientlist")
+
+    assert not antiflood.configured
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_antiflood_paces_by_points(monkeypatch: pytest.MonkeyPatch):
+    mock_sleep = mock.AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    antiflood = ratelimiter.AntiFloodLimiter(command_costs={"clientpoke": 25}, headroom=1)
+    antiflood.configure(points_tick_reduce=5, points_needed_command_block=150)
+
+    for _ in range(6):
+        await antiflood.wait("clientpoke clid=1 msg=hello")
+    mock_sleep.assert_not_awaited()
+
+    await antiflood.wait("clientpoke clid=1 msg=hello")
+    mock_sleep.assert_awaited_once_with(pytest.approx(5, abs=0.01))
+
+
+def test_antiflood_disabled_by_server():
+    antiflood = ratelimiter.AntiFloodLimiter()
+    antiflood.configure(points_tick_reduce=0, points_needed_command_block=0)
+
+    assert not antiflood.configured
+
+
+def test_bot_antiflood_costs():
+    bot = TSBot(
+        "serveradmin",
+        "password",
+        "localhost",
+        protocol="raw",
+        antiflood=True,
+        antiflood_costs={"clientpoke": 25},
+        antiflood_default_cost=2,
+        query_sessions=2,
+    )
+    assert isinstance(bot._connection, connection.TSConnectionPool)
+
+    limiters = [s._antiflood for s in (bot._connection._primary, *bot._connection._secondaries)]
+
+    assert limiters[0] is not limiters[1]
+    for limiter in limiters:
+        assert limiter
+        assert limiter.cost("clientpoke clid=1 msg=hello") == 25
+        assert limiter.cost("clientlist") == 2
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tsbot.connection import reader
+
+# pyright: reportPrivateUsage=false
+
+
+@pytest.fixture
+def buffer():
+    return reader._ResponseBuffer()
+
+
+def create_future() -> asyncio.Future[tuple[str, ...]]:
+    return asyncio.get_running_loop().create_future()
+
+
+@pytest.mark.asyncio
+async def test_responses_resolved_in_order(buffer: reader._ResponseBuffer):
+    first, second = create_future(), create_future()
+    buffer.track(first)
+    buffer.track(second)
+
+    buffer.put(("error id=0 msg=ok",))
+    buffer.put(("error id=256 msg=command\\snot\\sfound",))
+
+    assert await first == ("error id=0 msg=ok",)
+    assert await second == ("error id=256 msg=command\\snot\\sfound",)
+    assert not buffer
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_consumes_response(buffer: reader._ResponseBuffer):
+    abandoned, waiting = create_future(), create_future()
+    buffer.track(abandoned)
+    buffer.track(waiting)
+
+    abandoned.cancel()
+    buffer.put(("version=3.13.3", "error id=0 msg=ok"))
+    buffer.put(("error id=0 msg=ok",))
+
+    assert await waiting == ("error id=0 msg=ok",)
+
+
+@pytest.mark.asyncio
+async def test_skipped_responses_are_discarded(buffer: reader._ResponseBuffer):
+    waiting = create_future()
+    buffer.skip(2)
+    buffer.track(waiting)
+
+    for _ in range(3):
+        buffer.put(("error id=0 msg=ok",))
+
+    assert waiting.done()
+    assert not buffer
+
+
+@pytest.mark.asyncio
+async def test_close_fails_waiters(buffer: reader._ResponseBuffer):
+    waiting = create_future()
+    buffer.skip()
+    buffer.track(waiting)
+
+    buffer.close()
+
+    with pytest.raises(ConnectionResetError):
+        await waiting
+
+
+@pytest.mark.asyncio
+async def test_read_response_timeout_keeps_pairing(buffer: reader._ResponseBuffer):
+    response_reader = reader.Reader(
+        connection=None,  # type: ignore
+        on_notify=lambda _: None,
+        read_timeout=0,
+        ready_to_read=asyncio.Event(),
+    )
+    response_reader._response_buffer = buffer
+
+    timed_out, waiting = create_future(), create_future()
+    response_reader.track_response(timed_out)
+    response_reader.track_response(waiting)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await response_reader.read_response(timed_out)
+
+    buffer.put(("error id=0 msg=ok",))
+    buffer.put(("whoami=1", "error id=0 msg=ok"))
+
+    assert await waiting == ("whoami=1", "error id=0 msg=ok")
+
+
+@pytest.mark.asyncio
+async def test_full_event_queue_holds_reading_until_response_expected():
+    not_full = asyncio.Event()
+    response_reader = reader.Reader(
+        connection=None,  # type: ignore
+        on_notify=lambda _: None,
+        read_timeout=1,
+        ready_to_read=asyncio.Event(),
+        events_not_full=not_full,
+    )
+
+    waiting = asyncio.create_task(response_reader._wait_for_event_room())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    response_reader.track_response(create_future())
+    assert await asyncio.wait_for(waiting, timeout=1)
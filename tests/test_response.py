@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
-from tsbot import response
+from tsbot import parsers, response
+
+# pyright: reportPrivateUsage=false
 
 
 @pytest.mark.parametrize(
@@ -103,3 +106,64 @@ def test_response_getitem():
 
     for key in resp.data[0]:
         assert resp[key] is resp.data[0][key]
+
+
+LAZY_RESPONSE = [
+    "clid=1 cid=1|clid=2 cid=3|clid=5 client_nickname=Test\\sUser",
+    "error id=0 msg=ok",
+]
+
+
+def test_lazy_response_matches_eager():
+    eager = response.TSResponse.from_server_response(LAZY_RESPONSE)
+    lazy = response.TSResponse.from_server_response(LAZY_RESPONSE, lazy=True)
+
+    assert isinstance(lazy, response.LazyTSResponse)
+    assert list(lazy) == list(eager)
+    assert lazy.data == eager.data
+    assert lazy.last == eager.last
+    assert lazy["clid"] == "1"
+    assert lazy.get("missing", "default") == "default"
+
+
+def test_lazy_response_parses_only_accessed_rows(monkeypatch: pytest.MonkeyPatch):
+    parse_line = mock.Mock(wraps=parsers.parse_line)
+    resp = response.TSResponse.from_server_response(LAZY_RESPONSE, lazy=True)
+    monkeypatch.setattr(parsers, "parse_line", parse_line)
+
+    assert resp.first is resp.first
+    assert resp.last["client_nickname"] == "Test User"
+    assert parse_line.call_count == 2
+
+
+@pytest.mark.parametrize(
+    ("input_list", "expected_data"),
+    (
+        pytest.param(["error id=0 msg=ok"], (), id="test_acknowledgement"),
+        pytest.param(
+            ["error id=524 msg=flood extra_msg=wait\\s2\\sseconds"],
+            ({"extra_msg": "wait 2 seconds"},),
+            id="test_error_extra_fields",
+        ),
+    ),
+)
+def test_lazy_response_error_line(input_list: list[str], expected_data: tuple[dict[str, str], ...]):
+    resp = response.TSResponse.from_server_response(input_list, lazy=True)
+
+    assert resp.data == expected_data
+    assert resp.data == response.TSResponse.from_server_response(input_list).data
+
+
+def test_compact_response_shares_key_tables():
+    resp = response.TSResponse.from_server_response(LAZY_RESPONSE)
+    compact = resp.compact()
+
+    assert isinstance(compact, response.CompactTSResponse)
+    assert list(compact) == list(resp)
+    assert compact["clid"] == "1"
+    assert compact.last.get("client_nickname") == "Test User"
+    assert "client_nickname" not in compact.first
+    first, second, third = compact.data
+    assert first._table is second._table
+    assert first._table is not third._table
+    assert compact.compact() is compact
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import pytest
+
+from tsbot import response, schemas
+
+
+class Record(NamedTuple):
+    id: int
+    name: str
+    enabled: bool
+    ratio: float
+    groups: tuple[int, ...] = ()
+    topic: str | None = None
+
+
+SCHEMA = schemas.Schema(Record)
+
+
+@pytest.mark.parametrize(
+    ("row", "expected"),
+    (
+        pytest.param(
+            {"id": "1", "name": "Lobby", "enabled": "1", "ratio": "0.5"},
+            Record(1, "Lobby", True, 0.5),
+            id="test_defaults",
+        ),
+        pytest.param(
+            {"id": "2", "name": "", "enabled": "0", "ratio": "1", "groups": "6,8", "topic": "x"},
+            Record(2, "", False, 1.0, (6, 8), "x"),
+            id="test_all_fields",
+        ),
+        pytest.param(
+            {"id": "3", "name": "a", "enabled": "0", "ratio": "0", "groups": "", "topic": ""},
+            Record(3, "a", False, 0.0, (), None),
+            id="test_empty_values",
+        ),
+    ),
+)
+def test_decode_row(row: dict[str, str], expected: Record):
+    assert SCHEMA.decode_row(row) == expected
+
+
+def test_missing_required_field_raises():
+    with pytest.raises(KeyError):
+        SCHEMA.decode_row({"id": "1"})
+
+
+def test_unsupported_field_type_raises():
+    class Unsupported(NamedTuple):
+        values: list[str]
+
+    with pytest.raises(TypeError):
+        schemas.Schema(Unsupported)
+
+
+def test_decode_clientlist_response():
+    resp = response.TSResponse.from_server_response(
+        [
+            "clid=1 cid=1 client_database_id=1 client_nickname=Server\\sQuery client_type=1"
+            " client_servergroups=2"
+            "|clid=5 cid=2 client_database_id=7 client_nickname=Alice client_type=0"
+            " client_servergroups=6,8",
+            "error id=0 msg=ok",
+        ],
+        lazy=True,
+    )
+
+    clients = resp.decode(schemas.SCHEMAS["clientlist"])
+
+    assert [c.client_nickname for c in clients] == ["Server Query", "Alice"]
+    assert clients[1].client_servergroups == (6, 8)
+    assert clients[1].client_unique_identifier is None
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from tsbot.connection import single_flight
+
+
+@pytest.mark.asyncio
+async def test_calls_in_flight_share_result():
+    flight: single_flight.SingleFlight[str] = single_flight.SingleFlight()
+    call = mock.AsyncMock(return_value="result")
+
+    results = await asyncio.gather(*(flight.do("clientlist", call) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    call.assert_awaited_once()
+    assert "clientlist" not in flight
+
+
+@pytest.mark.asyncio
+async def test_different_keys_not_shared():
+    flight: single_flight.SingleFlight[str] = single_flight.SingleFlight()
+    call = mock.AsyncMock(return_value="result")
+
+    await asyncio.gather(flight.do("clientlist", call), flight.do("channellist", call))
+
+    assert call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_calls_share_exception():
+    flight: single_flight.SingleFlight[str] = single_flight.SingleFlight()
+    call = mock.AsyncMock(side_effect=ConnectionResetError)
+
+    results = await asyncio.gather(
+        flight.do("clientlist", call), flight.do("clientlist", call), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ConnectionResetError) for result in results)
+    call.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_call():
+    flight: single_flight.SingleFlight[str] = single_flight.SingleFlight()
+    release = asyncio.Event()
+
+    async def call() -> str:
+        await release.wait()
+        return "result"
+
+    cancelled = asyncio.create_task(flight.do("clientlist", call))
+    waiting = asyncio.create_task(flight.do("clientlist", call))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    release.set()
+
+    assert await waiting == "result"
+    assert len(flight) == 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+from unittest import mock
+
+import pytest
+
+from tsbot.connection.connection_types import ssh_connection
+
+
+def fake_ssh_connection() -> mock.Mock:
+    ssh = mock.Mock()
+    ssh.is_closed.return_value = False
+    ssh.open_session = mock.AsyncMock(
+        side_effect=lambda: (mock.Mock(wait_closed=mock.AsyncMock()), mock.Mock(), mock.Mock())
+    )
+    ssh.wait_closed = mock.AsyncMock()
+    return ssh
+
+
+@pytest.fixture
+def asyncssh_connect() -> Generator[mock.AsyncMock, None, None]:
+    with mock.patch.object(
+        ssh_connection.asyncssh,
+        "connect",
+        new=mock.AsyncMock(side_effect=lambda **_: fake_ssh_connection()),  # type: ignore
+    ) as connect:
+        yield connect
+
+
+# pyright: reportPrivateUsage=false
+
+
+def ssh_of(session: ssh_connection.SSHConnection) -> mock.Mock:
+    ssh = session._transport._connection
+    assert isinstance(ssh, mock.Mock)
+    return ssh
+
+
+@pytest.mark.asyncio
+async def test_channels_share_transport(asyncssh_connect: mock.AsyncMock):
+    primary = ssh_connection.SSHConnection("serveradmin", "password", "localhost", 10022)
+    channel = primary.open_channel()
+
+    await primary.connect()
+    await channel.connect()
+
+    assert channel._transport is primary._transport
+    asyncssh_connect.assert_awaited_once()
+    assert ssh_of(primary).open_session.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_transport_closed_after_last_channel(asyncssh_connect: mock.AsyncMock):
+    primary = ssh_connection.SSHConnection("serveradmin", "password", "localhost", 10022)
+    channel = primary.open_channel()
+
+    await primary.connect()
+    await channel.connect()
+    ssh = ssh_of(primary)
+
+    primary.close()
+    primary.close()
+    ssh.close.assert_not_called()
+    assert primary._transport._users == 1
+
+    channel.close()
+    ssh.close.assert_called_once()
+    assert primary._transport._users == 0
+
+
+@pytest.mark.asyncio
+async def test_transport_reused_across_reconnects(asyncssh_connect: mock.AsyncMock):
+    primary = ssh_connection.SSHConnection("serveradmin", "password", "localhost", 10022)
+    channel = primary.open_channel()
+
+    await primary.connect()
+    await channel.connect()
+    first = ssh_of(primary)
+
+    # Reconnecting a session reuses the connection that is still open
+    await channel.connect()
+    asyncssh_connect.assert_awaited_once()
+    assert primary._transport._users == 2
+
+    first.is_closed.return_value = True
+    await primary.connect()
+    await channel.connect()
+
+    assert asyncssh_connect.await_count == 2
+    assert primary._transport._connection is not first
+    assert primary._transport._users == 2
+
+
+@pytest.mark.asyncio
+async def test_closed_while_connecting_aborts(asyncssh_connect: mock.AsyncMock):
+    connecting = asyncio.Event()
+    ssh = fake_ssh_connection()
+
+    async def connect(**_: object) -> mock.Mock:
+        connecting.set()
+        await asyncio.sleep(0)
+        return ssh
+
+    asyncssh_connect.side_effect = connect
+    primary = ssh_connection.SSHConnection("serveradmin", "password", "localhost", 10022)
+
+    task = asyncio.create_task(primary.connect())
+    await connecting.wait()
+    primary.close()
+
+    with pytest.raises(ConnectionAbortedError):
+        await asyncio.wait_for(task, timeout=1)
+
+    ssh.close.assert_called_once()
+    ssh.open_session.assert_not_awaited()
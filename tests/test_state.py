@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from tsbot import context, events, response, state
+from tsbot.bot import TSBot
+
+# pyright: reportPrivateUsage=false
+
+
+def ctx(**data: str) -> context.TSCtx:
+    return context.TSCtx(data)
+
+
+def create_response(*data: dict[str, str]) -> response.TSResponse:
+    return response.TSResponse(data=data, error_id=0, msg="ok")
+
+
+CLIENTS = create_response(
+    {
+        "clid": "1",
+        "cid": "1",
+        "client_database_id": "1",
+        "client_nickname": "bot",
+        "client_type": "1",
+        "client_unique_identifier": "botuid",
+    },
+    {
+        "clid": "5",
+        "cid": "2",
+        "client_database_id": "7",
+        "client_nickname": "Alice",
+        "client_type": "0",
+        "client_unique_identifier": "aliceuid",
+    },
+)
+CHANNELS = create_response(
+    {"cid": "1", "pid": "0", "channel_order": "0", "channel_name": "Lobby"},
+    {"cid": "2", "pid": "0", "channel_order": "1", "channel_name": "AFK"},
+)
+
+
+@pytest.fixture
+def bot():
+    bot = mock.Mock(spec=TSBot)
+    bot.send_many = mock.AsyncMock(return_value=[CLIENTS, CHANNELS])
+    return bot
+
+
+@pytest.mark.asyncio
+async def test_sync(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+
+    assert server_state.synced
+    assert server_state.clients.keys() == {"1", "5"}
+    assert server_state.get_channel("2") == CHANNELS.data[1]
+
+
+@pytest.mark.asyncio
+async def test_client_events(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+
+    await server_state.on_client_enter(
+        bot, ctx(clid="7", ctid="1", cfid="0", reasonid="0", client_nickname="Bob")
+    )
+    assert server_state.get_client("7") == {"clid": "7", "cid": "1", "client_nickname": "Bob"}
+
+    await server_state.on_client_moved(bot, ctx(clid="7", ctid="2", reasonid="0"))
+    assert sorted(c["clid"] for c in server_state.channel_clients("2")) == ["5", "7"]
+
+    await server_state.on_client_left(bot, ctx(clid="7", cfid="2", ctid="0", reasonid="8"))
+    assert server_state.get_client("7") is None
+
+
+@pytest.mark.asyncio
+async def test_channel_events(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+
+    await server_state.on_channel_created(
+        bot, ctx(cid="3", cpid="1", channel_name="Sub", channel_order="0", invokerid="5")
+    )
+    assert server_state.get_channel("3") == {
+        "cid": "3",
+        "pid": "1",
+        "channel_name": "Sub",
+        "channel_order": "0",
+    }
+
+    await server_state.on_channel_edited(bot, ctx(cid="3", channel_name="Renamed", reasonid="10"))
+    await server_state.on_channel_moved(bot, ctx(cid="3", cpid="0", order="2", reasonid="1"))
+
+    channel = server_state.get_channel("3")
+    assert channel
+    assert (channel["channel_name"], channel["pid"], channel["channel_order"]) == (
+        "Renamed",
+        "0",
+        "2",
+    )
+
+    await server_state.on_channel_deleted(bot, ctx(cid="3", invokerid="5"))
+    assert server_state.get_channel("3") is None
+
+
+@pytest.mark.asyncio
+async def test_channel_clients_changed_while_iterating(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+    await server_state.on_client_enter(bot, ctx(clid="7", ctid="2", client_nickname="Bob"))
+
+    moved: list[str] = []
+    for client in server_state.channel_clients("2"):
+        moved.append(client["clid"])
+        await server_state.on_client_moved(bot, ctx(clid=client["clid"], ctid="1"))
+
+        # The other client leaves before it is iterated
+        other = "7" if client["clid"] == "5" else "5"
+        await server_state.on_client_left(bot, ctx(clid=other, cfid="2", ctid="0"))
+
+    assert len(moved) == 1
+    assert not list(server_state.channel_clients("2"))
+
+
+@pytest.mark.asyncio
+async def test_notification_about_several_clients(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+    await server_state.on_client_enter(bot, ctx(clid="7", ctid="2", client_nickname="Bob"))
+
+    moved = events.TSEvent.from_server_notification(
+        "notifyclientmoved ctid=1 reasonid=4 clid=5|clid=7"
+    )
+    await server_state.on_client_moved(bot, moved.ctx)
+    assert sorted(c["clid"] for c in server_state.channel_clients("1")) == ["1", "5", "7"]
+
+    left = events.TSEvent.from_server_notification(
+        "notifyclientleftview cfid=1 ctid=0 reasonid=8 clid=1|clid=7"
+    )
+    await server_state.on_client_left(bot, left.ctx)
+    assert server_state.clients.keys() == {"5"}
+
+
+@pytest.mark.asyncio
+async def test_events_during_sync_applied(bot: mock.Mock):
+    server_state = state.ServerState()
+    responses: asyncio.Future[list[response.TSResponse]] = (
+        asyncio.get_running_loop().create_future()
+    )
+    bot.send_many = mock.Mock(return_value=responses)
+
+    sync = asyncio.create_task(server_state.sync(bot))
+    await asyncio.sleep(0)
+
+    await server_state.on_client_left(bot, ctx(clid="5", cfid="2", ctid="0", reasonid="8"))
+    responses.set_result([CLIENTS, CHANNELS])
+    await sync
+
+    assert server_state.clients.keys() == {"1"}
+
+
+@pytest.mark.asyncio
+async def test_client_lookups(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+
+    alice = server_state.get_client("5")
+    assert server_state.client_by_uid("aliceuid") is alice
+    assert server_state.client_by_dbid("7") is alice
+    assert list(server_state.clients_by_nickname("ALICE")) == [alice]
+    assert list(server_state.channel_clients("2")) == [alice]
+    assert server_state.client_by_uid("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_indexes_follow_events(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.sync(bot)
+
+    await server_state.on_client_enter(
+        bot,
+        ctx(
+            clid="8",
+            ctid="1",
+            client_database_id="7",
+            client_nickname="alice",
+            client_unique_identifier="aliceuid",
+        ),
+    )
+    assert sorted(c["clid"] for c in server_state.clients_by_uid("aliceuid")) == ["5", "8"]
+    assert len(list(server_state.clients_by_nickname("Alice"))) == 2
+
+    await server_state.on_client_moved(bot, ctx(clid="5", ctid="1"))
+    assert not list(server_state.channel_clients("2"))
+
+    await server_state.on_client_left(bot, ctx(clid="5", ctid="0"))
+    await server_state.on_client_left(bot, ctx(clid="8", ctid="0"))
+    assert server_state.client_by_uid("aliceuid") is None
+    assert server_state.client_by_dbid("7") is None
+    assert [c["clid"] for c in server_state.channel_clients("1")] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_task_removed_on_unload(bot: mock.Mock):
+    server_state = state.ServerState()
+    await server_state.on_connect(bot, None)
+
+    task = bot.register_every_task.return_value
+    server_state.on_unload(bot)
+
+    bot.remove_task.assert_called_once_with(task)
+    assert server_state._task is None
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tsbot import utils
+
+
+async def returns(value: int) -> int:
+    return value
+
+
+async def suspends(value: int) -> int:
+    await asyncio.sleep(0)
+    return value
+
+
+async def raises() -> None:
+    raise ValueError
+
+
+@pytest.mark.asyncio
+async def test_eager_task_finishes_without_suspending():
+    future = utils.eager_task(returns(1))
+
+    assert future.done()
+    assert future.result() == 1
+
+
+@pytest.mark.asyncio
+async def test_eager_task_continues_after_suspending():
+    future = utils.eager_task(suspends(2))
+
+    assert not future.done()
+    assert await future == 2
+
+
+@pytest.mark.asyncio
+async def test_eager_task_exception():
+    future = utils.eager_task(raises())
+
+    with pytest.raises(ValueError):
+        await future
+
+
+@pytest.mark.asyncio
+async def test_eager_task_cancel_after_suspending():
+    future = utils.eager_task(asyncio.sleep(10))
+    await asyncio.sleep(0)
+    future.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await future
+
+
+@pytest.mark.asyncio
+async def test_eager_task_is_current_task_before_suspending():
+    first_step_task: asyncio.Task[None] | None = None
+
+    async def get_current_task() -> None:
+        nonlocal first_step_task
+        first_step_task = asyncio.current_task()
+        await asyncio.sleep(0)
+
+    caller = asyncio.current_task()
+    future = utils.eager_task(get_current_task())
+
+    assert first_step_task is future
+    assert asyncio.current_task() is caller
+    await future
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from tsbot import ratelimiter
+from tsbot.connection import writer
+
+
+@pytest.fixture
+def ts_writer():
+    ready = asyncio.Event()
+    ready.set()
+
+    return writer.Writer(
+        connection=mock.AsyncMock(),
+        ratelimiter=None,
+        ready_to_write=ready,
+        on_send=mock.Mock(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_not_paused(monkeypatch: pytest.MonkeyPatch, ts_writer: writer.Writer):
+    mock_sleep = mock.AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", mock_sleep)
+
+    await ts_writer.write("version")
+
+    assert not ts_writer.paused
+    mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_write_waits_for_pause(ts_writer: writer.Writer):
+    on_write = mock.Mock()
+    ts_writer.pause(0.05)
+
+    write = asyncio.create_task(ts_writer.write("version", on_write=on_write))
+    await asyncio.sleep(0.01)
+
+    assert ts_writer.paused
+    on_write.assert_not_called()
+
+    await write
+    on_write.assert_called_once()
+
+
+def test_pause_is_not_shortened(ts_writer: writer.Writer):
+    ts_writer.pause(10)
+    ts_writer.pause(0)
+
+    assert ts_writer.paused
+
+
+@pytest.mark.asyncio
+async def test_write_many():
+    connection = mock.AsyncMock()
+    on_send, on_write = mock.Mock(), mock.Mock()
+    ready = asyncio.Event()
+    ready.set()
+
+    ts_writer = writer.Writer(connection, ratelimiter=None, ready_to_write=ready, on_send=on_send)
+    await ts_writer.write_many(("clientpoke clid=1", "clientpoke clid=2"), on_write=on_write)
+
+    on_write.assert_called_once_with(2)
+    connection.write_many.assert_awaited_once_with(("clientpoke clid=1", "clientpoke clid=2"))
+    assert on_send.call_count == 2
+
+
+def test_batch_size_limited_by_ratelimiter():
+    ts_writer = writer.Writer(
+        connection=mock.AsyncMock(),
+        ratelimiter=ratelimiter.RateLimiter(max_calls=10, period=3),
+        ready_to_write=asyncio.Event(),
+        on_send=mock.Mock(),
+    )
+
+    assert ts_writer.batch_size == 10
+
+
+def test_batches_stay_within_antiflood_budget():
+    antiflood = ratelimiter.AntiFloodLimiter(command_costs={"clientpoke": 10})
+    antiflood.configure(points_tick_reduce=5, points_needed_command_block=150)
+
+    ready = asyncio.Event()
+    ts_writer = writer.Writer(
+        connection=mock.AsyncMock(),
+        ratelimiter=None,
+        ready_to_write=ready,
+        on_send=mock.Mock(),
+        antiflood=antiflood,
+    )
+    assert antiflood.burst
+
+    raw_queries = ["clientpoke clid=1 msg=hi"] * 100 + ["clientlist"] * 300
+    batches = list(ts_writer.batches(raw_queries))
+
+    assert [q for batch in batches for q in batch] == raw_queries
+    assert all(sum(map(antiflood.cost, batch)) <= antiflood.burst for batch in batches)
+    assert all(len(batch) <= ts_writer.batch_size for batch in batches)
+
+
+def test_batches_without_antiflood(ts_writer: writer.Writer):
+    batches = list(ts_writer.batches(["clientlist"] * 250))
+
+    assert [len(batch) for batch in batches] == [100, 100, 50]
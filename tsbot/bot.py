@@ -3,28 +3,28 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import inspect
-from collections.abc import Callable, Iterable, Sequence
-from typing import TYPE_CHECKING, Any, Literal, NamedTuple, overload
+from collections.abc import AsyncGenerator, Callable, Iterable, Mapping, Sequence
+from typing import Any, Literal, NamedTuple, overload
 
 from typing_extensions import TypeVarTuple, Unpack
 
 import tsbot.logging
 from tsbot import (
+    cache,
     commands,
     connection,
     context,
     default_plugins,
     enums,
     events,
+    exceptions,
     plugin,
     query_builder,
     ratelimiter,
     response,
     tasks,
 )
-
-if TYPE_CHECKING:
-    from tsbot.events import event_types
+from tsbot.events import event_types
 
 _Ts = TypeVarTuple("_Ts")
 
@@ -57,7 +57,20 @@ class TSBot:
         ratelimited: bool = False,
         ratelimit_calls: int = 10,
         ratelimit_period: float = 3,
+        ratelimit_burst: int | None = None,
+        antiflood: bool = False,
+        antiflood_costs: Mapping[str, float] | None = None,
+        antiflood_default_cost: float = 1,
         query_timeout: float = 5,
+        pipelined: bool = False,
+        query_sessions: int = 1,
+        flood_retries: int = 3,
+        deduplicate_queries: bool = False,
+        response_cache: cache.ResponseCache | None = None,
+        lazy_responses: bool = False,
+        event_queue_size: int = 0,
+        event_overflow: events.OverflowPolicy | None = None,
+        event_workers: int = 100,
         default_plugins: Iterable[plugin.TSPlugin] = default_plugins.DEFAULT_PLUGINS,
     ) -> None:
         """
@@ -74,7 +87,20 @@ class TSBot:
         :param ratelimited: If the connection should be ratelimited.
         :param ratelimit_calls: Calls per period.
         :param ratelimit_period: Period interval.
+        :param ratelimit_burst: Calls that can be made at once. Defaults to `ratelimit_calls`.
+        :param antiflood: Pace queries by the anti-flood settings of the virtual server.
+        :param antiflood_costs: Anti-flood points each command costs, by the command name.
+        :param antiflood_default_cost: Anti-flood points a command not in `antiflood_costs` costs.
         :param query_timeout: Timeout for each query command in seconds.
+        :param pipelined: Send queries without waiting for the responses of the previous ones.
+        :param query_sessions: Number of query sessions to open. Read-only queries are balanced between the sessions.
+        :param flood_retries: Times an idempotent query is retried after a flood error.
+        :param deduplicate_queries: Identical read-only queries sent at the same time share one response.
+        :param response_cache: Cache for the responses of read-only queries.
+        :param lazy_responses: Parse the rows of responses only once they are accessed.
+        :param event_queue_size: Maximum amount of events waiting to be handled. Unbounded if 0.
+        :param event_overflow: What to do with events when the event queue is full. Defaults to dropping the oldest event.
+        :param event_workers: Maximum amount of events handled at once.
         :param default_plugins: Plugins that will be loaded by default.
         """  # noqa: D205
         if nickname is not None and not nickname:
@@ -82,28 +108,75 @@ class TSBot:
 
         port = _DEFAULT_PORTS[protocol] if port is None else port
 
+        if query_sessions < 1:
+            raise ValueError("Bot needs at least one query session")
+
         connection_type = (
             connection.RawConnection(username, password, address, port)
             if protocol == "raw"
             else connection.SSHConnection(username, password, address, port)
         )
-        connection_ratelimiter = (
-            ratelimiter.RateLimiter(ratelimit_calls, ratelimit_period) if ratelimited else None
-        )
 
-        self._connection = connection.TSConnection(
-            event_emitter=self.emit_event,
-            connection=connection_type,
-            server_id=server_id,
-            nickname=nickname,
-            query_timeout=query_timeout,
-            connection_retries=connection_retries,
-            connection_retry_interval=connection_retry_timeout,
-            ratelimiter=connection_ratelimiter,
+        def create_secondary_connection_type() -> connection.abc.Connection:
+            """SSH query sessions are opened as channels on the same SSH connection."""
+            if isinstance(connection_type, connection.SSHConnection):
+                return connection_type.open_channel()
+
+            return connection.RawConnection(username, password, address, port)
+
+        def emit_secondary_event(event: events.TSEvent) -> None:
+            """Secondary query sessions only report flood errors."""
+            if event.event == "flood":
+                self.emit_event(event)
+
+        def create_connection(
+            connection_type: connection.abc.Connection, primary: bool
+        ) -> connection.TSConnection:
+            return connection.TSConnection(
+                event_emitter=self.emit_event if primary else emit_secondary_event,
+                connection=connection_type,
+                server_id=server_id,
+                nickname=nickname if primary else None,
+                query_timeout=query_timeout,
+                connection_retries=connection_retries,
+                connection_retry_interval=connection_retry_timeout,
+                ratelimiter=(
+                    ratelimiter.RateLimiter(ratelimit_calls, ratelimit_period, ratelimit_burst)
+                    if ratelimited
+                    else None
+                ),
+                antiflood=(
+                    ratelimiter.AntiFloodLimiter(antiflood_costs, antiflood_default_cost)
+                    if antiflood
+                    else None
+                ),
+                pipelined=pipelined,
+                register_notifications=primary,
+                flood_retries=flood_retries,
+                deduplicate_queries=deduplicate_queries and query_sessions == 1,
+                events_not_full=self._event_manager.not_full if primary else None,
+                lazy_responses=lazy_responses,
+            )
+
+        self._event_manager = events.EventManager(event_queue_size, event_overflow, event_workers)
+
+        primary_connection = create_connection(connection_type, primary=True)
+        self._connection: connection.TSConnection | connection.TSConnectionPool = (
+            connection.TSConnectionPool(
+                primary=primary_connection,
+                secondaries=[
+                    create_connection(create_secondary_connection_type(), primary=False)
+                    for _ in range(query_sessions - 1)
+                ],
+                deduplicate_queries=deduplicate_queries,
+            )
+            if query_sessions > 1
+            else primary_connection
         )
 
+        self._response_cache = response_cache
+
         self._task_manager = tasks.TaskManager()
-        self._event_manager = events.EventManager()
         self._command_manager = commands.CommandManager(invoker)
 
         self.plugins: set[plugin.TSPlugin] = set()
@@ -115,6 +188,7 @@ class TSBot:
         self.register_event_handler("textmessage", self._command_manager.handle_command_event)
 
         self.load_plugin(*default_plugins)
+        self._update_notification_classes()
 
     @property
     def uid(self) -> str:
@@ -136,6 +210,11 @@ class TSBot:
         """Is the bot currently connected to a server."""
         return self._connection.connected
 
+    @property
+    def event_stats(self) -> events.EventQueueStats:
+        """Events waiting to be handled and events dropped or coalesced from the event queue."""
+        return self._event_manager.stats
+
     def emit(self, event_name: str, ctx: Any | None = None) -> None:
         """
         Creates :class:`~tsbot.events.TSEvent` instance and emits it.
@@ -159,29 +238,69 @@ class TSBot:
 
         :param event: Event to be emitted.
         """
+        if self._response_cache is not None:
+            self._response_cache.invalidate_after_event(event.event)
+
         self._event_manager.add_event(event)
 
     @overload
     def on(
-        self, event_type: event_types.BUILTIN_EVENTS
+        self,
+        event_type: event_types.BUILTIN_EVENTS,
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> Callable[[events.EventHandler[context.TSCtx]], events.EventHandler[context.TSCtx]]: ...
 
     @overload
     def on(
-        self, event_type: event_types.BUILTIN_NO_CTX_EVENTS
+        self,
+        event_type: event_types.BUILTIN_NO_CTX_EVENTS,
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> Callable[[events.EventHandler[None]], events.EventHandler[None]]: ...
 
     @overload
     def on(
-        self, event_type: event_types.TS_EVENTS
+        self,
+        event_type: event_types.TS_EVENTS,
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> Callable[[events.EventHandler[context.TSCtx]], events.EventHandler[context.TSCtx]]: ...
 
     @overload
     def on(
-        self, event_type: str
+        self,
+        event_type: str,
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> Callable[[events.EventHandler[Any]], events.EventHandler[Any]]: ...
 
-    def on(self, event_type: str) -> Callable[[events.EventHandler[Any]], events.EventHandler[Any]]:
+    def on(
+        self,
+        event_type: str,
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
+    ) -> Callable[[events.EventHandler[Any]], events.EventHandler[Any]]:
         """
         Decorator to register event handlers.
 
@@ -191,36 +310,89 @@ class TSBot:
         is called with the bot instance and the event context.
 
         :param event_type: Name of the event.
+        :param coalesce_key: Context field, or function of the context, to coalesce events by.
+        :param coalesce_window: Seconds to wait for newer events with the same key.
+        :param eager: Start running the handler right away when the event is handled.
+        :param filters: Values the fields of the event context must have for the handler to run.
+        :param predicate: Function of the event context that must return `True` for the handler to run.
         """
 
         def event_decorator(func: events.EventHandler[Any]) -> events.EventHandler[Any]:
-            self.register_event_handler(event_type, func)
+            self.register_event_handler(
+                event_type,
+                func,
+                coalesce_key=coalesce_key,
+                coalesce_window=coalesce_window,
+                eager=eager,
+                filters=filters,
+                predicate=predicate,
+            )
             return func
 
         return event_decorator
 
     @overload
     def register_event_handler(
-        self, event_type: event_types.BUILTIN_EVENTS, handler: events.EventHandler[context.TSCtx]
+        self,
+        event_type: event_types.BUILTIN_EVENTS,
+        handler: events.EventHandler[context.TSCtx],
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> events.TSEventHandler: ...
 
     @overload
     def register_event_handler(
-        self, event_type: event_types.BUILTIN_NO_CTX_EVENTS, handler: events.EventHandler[None]
+        self,
+        event_type: event_types.BUILTIN_NO_CTX_EVENTS,
+        handler: events.EventHandler[None],
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> events.TSEventHandler: ...
 
     @overload
     def register_event_handler(
-        self, event_type: event_types.TS_EVENTS, handler: events.EventHandler[context.TSCtx]
+        self,
+        event_type: event_types.TS_EVENTS,
+        handler: events.EventHandler[context.TSCtx],
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> events.TSEventHandler: ...
 
     @overload
     def register_event_handler(
-        self, event_type: str, handler: events.EventHandler[Any]
+        self,
+        event_type: str,
+        handler: events.EventHandler[Any],
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> events.TSEventHandler: ...
 
     def register_event_handler(
-        self, event_type: str, handler: events.EventHandler[Any]
+        self,
+        event_type: str,
+        handler: events.EventHandler[Any],
+        *,
+        coalesce_key: events.CoalesceKey | None = None,
+        coalesce_window: float = 0.2,
+        eager: bool = False,
+        filters: Mapping[str, str] | None = None,
+        predicate: Callable[[Any], bool] | None = None,
     ) -> events.TSEventHandler:
         """
         Register an event handler.
@@ -230,12 +402,35 @@ class TSBot:
         When an event is emitted with the `event_type` name, the decorated async function
         is called with the bot instance and the event context.
 
+        If `coalesce_key` is given, events with the same key arriving within `coalesce_window`
+        seconds are coalesced, and the handler is called only with the newest of them.
+
         :param event_type: Name of the event.
         :param handler: Async function to handle the event.
+        :param coalesce_key: Context field, or function of the context, to coalesce events by.
+        :param coalesce_window: Seconds to wait for newer events with the same key.
+        :param eager: Start running the handler right away when the event is handled.
+        :param filters: Values the fields of the event context must have for the handler to run.
+        :param predicate: Function of the event context that must return `True` for the handler to run.
         :return: The instance of :class:`~tsbot.events.TSEventHandler` created.
         """
-        event_handler = events.TSEventHandler(event_type, handler)
+        event_handler = (
+            events.TSEventCoalescingHandler(
+                event_type,
+                handler,
+                coalesce_key,
+                coalesce_window,
+                eager=eager,
+                filters=filters,
+                predicate=predicate,
+            )
+            if coalesce_key is not None
+            else events.TSEventHandler(
+                event_type, handler, eager=eager, filters=filters, predicate=predicate
+            )
+        )
         self._event_manager.register_event_handler(event_handler)
+        self._update_notification_classes()
         return event_handler
 
     @overload
@@ -316,6 +511,7 @@ class TSBot:
         """
         event_handler = events.TSEventOnceHandler(event_type, handler, self.remove_event_handler)
         self._event_manager.register_event_handler(event_handler)
+        self._update_notification_classes()
         return event_handler
 
     def remove_event_handler(self, event_handler: events.TSEventHandler) -> None:
@@ -331,6 +527,16 @@ class TSBot:
         :param event_handler: Instance of the :class:`~tsbot.events.TSEventHandler` to be removed.
         """
         self._event_manager.remove_event_handler(event_handler)
+        self._update_notification_classes()
+
+    def _update_notification_classes(self) -> None:
+        """Register the server to send only the notifications that have handlers."""
+        handled_events = self._event_manager.handled_events
+
+        if self._response_cache is not None:
+            handled_events.update(self._response_cache.event_invalidations)
+
+        self._connection.set_notification_classes(event_types.notification_classes(handled_events))
 
     @overload
     def command(
@@ -557,33 +763,256 @@ class TSBot:
         """
         self._task_manager.remove_task(task)
 
-    async def send(self, query: query_builder.TSQuery) -> response.TSResponse:
+    async def send(
+        self,
+        query: query_builder.TSQuery,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
         """
         Send a query to the server.
 
         This method sends a query to the server and returns the response.
 
         If the server responds with an error, a :class:`~tsbot.exceptions.TSResponseError` is raised.
+        If the server considers the bot to be flooding, the bot pauses sending queries
+        and retries idempotent queries after the pause.
+        Responses from a compact response cache have read-only rows.
 
         :param query: Instance of :class:`~tsbot.query_builder.TSQuery` to be send to the server.
+        :param idempotent: If the query can be safely retried. Defaults to `True` for read-only queries.
+        :param priority: Priority of the query over the other queries waiting to be sent.
         :return: Response from the server as a :class:`~tsbot.response.TSResponse` instance.
         """
-        return await self._connection.send(query)
+        return await self.send_raw(query.compile(), idempotent=idempotent, priority=priority)
 
-    async def send_raw(self, raw_query: str) -> response.TSResponse:
+    async def send_raw(
+        self,
+        raw_query: str,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
         """
         Send raw commands to the server.
 
         this method sends a raw query to the server and returns the response.
 
         If the server responds with an error, a :class:`~tsbot.exceptions.TSResponseError` is raised.
+        If the server considers the bot to be flooding, the bot pauses sending queries
+        and retries idempotent queries after the pause.
 
         :param raw_query: Raw query command to be send to the server.
+        :param idempotent: If the query can be safely retried. Defaults to `True` for read-only queries.
+        :param priority: Priority of the query over the other queries waiting to be sent.
         :return: Response from the server as a :class:`~tsbot.response.TSResponse` instance.
         """
-        return await self._connection.send_raw(raw_query)
+        if self._response_cache is None:
+            return await self._connection.send_raw(
+                raw_query, idempotent=idempotent, priority=priority
+            )
+
+        if (cached := self._response_cache.get(raw_query)) is not None:
+            return cached
+
+        self._response_cache.invalidate_after_query(raw_query)
+        generation = self._response_cache.generation
+
+        resp = await self._connection.send_raw(raw_query, idempotent=idempotent, priority=priority)
+        self._response_cache.put(raw_query, resp, generation)
+
+        return resp
+
+    @overload
+    async def send_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: Literal[False] = False,
+        priority: enums.QueryPriority = ...,
+    ) -> list[response.TSResponse]: ...
+
+    @overload
+    async def send_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: Literal[True],
+        priority: enums.QueryPriority = ...,
+    ) -> list[response.TSResponse | exceptions.TSResponseError]: ...
+
+    async def send_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: bool = False,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> list[response.TSResponse] | list[response.TSResponse | exceptions.TSResponseError]:
+        """
+        Send multiple queries to the server and return their responses.
 
-    async def send_batched(self, queries: Iterable[query_builder.TSQuery]) -> None:
+        This method sends the queries without waiting for the responses in between,
+        like :meth:`send_batched`, but returns the responses in the same order as the queries.
+
+        If the server responds to a query with an error, a :class:`~tsbot.exceptions.TSResponseError` is raised.
+        With `return_exceptions`, the errors are returned in place of the responses instead.
+
+        :param queries: Iterable of :class:`~tsbot.query_builder.TSQuery` instances to be send to the server.
+        :param return_exceptions: Return the errors in place of the responses instead of raising them.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
+        :return: List of responses from the server.
+        """
+        return await self.send_many_raw(
+            (query.compile() for query in queries),
+            return_exceptions=return_exceptions,
+            priority=priority,
+        )
+
+    @overload
+    async def send_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: Literal[False] = False,
+        priority: enums.QueryPriority = ...,
+    ) -> list[response.TSResponse]: ...
+
+    @overload
+    async def send_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: Literal[True],
+        priority: enums.QueryPriority = ...,
+    ) -> list[response.TSResponse | exceptions.TSResponseError]: ...
+
+    async def send_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: bool = False,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> list[response.TSResponse] | list[response.TSResponse | exceptions.TSResponseError]:
+        """
+        Send multiple raw queries to the server and return their responses.
+
+        This method sends the queries without waiting for the responses in between,
+        like :meth:`send_batched_raw`, but returns the responses in the same order as the queries.
+
+        If the server responds to a query with an error, a :class:`~tsbot.exceptions.TSResponseError` is raised.
+        With `return_exceptions`, the errors are returned in place of the responses instead.
+
+        :param raw_queries: Iterable of raw query commands to be send to the server.
+        :param return_exceptions: Return the errors in place of the responses instead of raising them.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
+        :return: List of responses from the server.
+        """
+        results = self.stream_many_raw(
+            raw_queries,
+            return_exceptions=return_exceptions,
+            priority=priority,
+        )
+
+        async with contextlib.aclosing(results):
+            return [result async for result in results]
+
+    @overload
+    def stream_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: Literal[False] = False,
+        priority: enums.QueryPriority = ...,
+    ) -> AsyncGenerator[response.TSResponse, None]: ...
+
+    @overload
+    def stream_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: Literal[True],
+        priority: enums.QueryPriority = ...,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]: ...
+
+    def stream_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        return_exceptions: bool = False,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        """
+        Send multiple queries to the server and yield their responses as they arrive.
+
+        Works like :meth:`send_many`, but the responses can be handled
+        while the rest of the queries are still being sent.
+
+        .. code-block:: python
+
+            async for resp in bot.stream_many(queries):
+                print(resp["client_nickname"])
+
+        :param queries: Iterable of :class:`~tsbot.query_builder.TSQuery` instances to be send to the server.
+        :param return_exceptions: Yield the errors in place of the responses instead of raising them.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
+        """
+        return self.stream_many_raw(
+            (query.compile() for query in queries),
+            return_exceptions=return_exceptions,
+            priority=priority,
+        )
+
+    @overload
+    def stream_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: Literal[False] = False,
+        priority: enums.QueryPriority = ...,
+    ) -> AsyncGenerator[response.TSResponse, None]: ...
+
+    @overload
+    def stream_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: Literal[True],
+        priority: enums.QueryPriority = ...,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]: ...
+
+    async def stream_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        return_exceptions: bool = False,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        """
+        Send multiple raw queries to the server and yield their responses as they arrive.
+
+        Works like :meth:`send_many_raw`, but the responses can be handled
+        while the rest of the queries are still being sent.
+
+        :param raw_queries: Iterable of raw query commands to be send to the server.
+        :param return_exceptions: Yield the errors in place of the responses instead of raising them.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
+        """
+        results = self._connection.send_many_raw(raw_queries, priority=priority)
+
+        async with contextlib.aclosing(results):
+            async for result in results:
+                if isinstance(result, exceptions.TSResponseError) and not return_exceptions:
+                    raise result
+
+                yield result
+
+    async def send_batched(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
         """
         Send multiple queries to the server.
 
@@ -592,10 +1021,16 @@ class TSBot:
         If the server responds with an error, it is ignored.
 
         :param queries: Iterable of :class:`~tsbot.query_builder.TSQuery` instances to be send to the server.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
         """
-        await self._connection.send_batched(queries)
+        await self._connection.send_batched(queries, priority=priority)
 
-    async def send_batched_raw(self, raw_queries: Iterable[str]) -> None:
+    async def send_batched_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
         """
         Send multiple raw queries to the server.
 
@@ -604,8 +1039,9 @@ class TSBot:
         If the server responds with an error, it is ignored.
 
         :param raw_queries: Iterable of raw query commands to be send to the server.
+        :param priority: Priority of the queries over the other queries waiting to be sent.
         """
-        await self._connection.send_batched_raw(raw_queries)
+        await self._connection.send_batched_raw(raw_queries, priority=priority)
 
     def close(self) -> None:
         """
@@ -700,7 +1136,7 @@ class TSBot:
 
             for _, member in inspect.getmembers(plugin_to_be_loaded):
                 command_kwargs: plugin.CommandKwargs | None
-                event_kwargs: plugin.EventKwargs | None
+                event_kwargs: plugin.OnEventKwargs | None
                 once_kwargs: plugin.EventKwargs | None
 
                 if command_kwargs := getattr(member, plugin.COMMAND_ATTR, None):
@@ -784,7 +1220,8 @@ class TSBot:
             query_builder.TSQuery(
                 "sendtextmessage",
                 parameters={"targetmode": target_mode.value, "target": target, "msg": message},
-            )
+            ),
+            priority=enums.QueryPriority.INTERACTIVE,
         )
 
     async def respond_to_client(self, ctx: context.TSCtx, message: str) -> None:
@@ -814,5 +1251,6 @@ class TSBot:
                         "target": target,
                         "msg": message,
                     },
-                )
+                ),
+                priority=enums.QueryPriority.INTERACTIVE,
             )
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import collections
+import time
+from collections.abc import Collection, Iterable, Mapping
+from typing import TYPE_CHECKING, NamedTuple
+
+import tsbot.logging
+from tsbot.query_builder import commands
+
+if TYPE_CHECKING:
+    from tsbot import response
+
+
+logger = tsbot.logging.get_logger(__name__)
+
+
+DEFAULT_TTLS: Mapping[str, float] = {
+    "clientgetdbidfromuid": 5 * 60,
+    "clientgetnamefromdbid": 5 * 60,
+    "clientgetnamefromuid": 5 * 60,
+    "servergroupsbyclientid": 30,
+    "servergrouplist": 60,
+    "channelgrouplist": 60,
+    "serverinfo": 30,
+}
+"""Seconds the responses of each command are cached for."""
+
+DEFAULT_EVENT_INVALIDATIONS: Mapping[str, Collection[str]] = {
+    "cliententerview": ("servergroupsbyclientid",),
+    "clientmoved": ("servergroupsbyclientid",),
+    "serveredited": ("serverinfo", "servergrouplist", "servergroupsbyclientid"),
+}
+"""Commands whose cached responses are dropped on each server notification."""
+
+DEFAULT_QUERY_INVALIDATIONS: Mapping[str, Collection[str]] = {
+    "servergroupaddclient": ("servergroupsbyclientid",),
+    "servergroupdelclient": ("servergroupsbyclientid",),
+    "servergroupadd": ("servergrouplist",),
+    "servergroupcopy": ("servergrouplist",),
+    "servergroupdel": ("servergrouplist", "servergroupsbyclientid"),
+    "servergrouprename": ("servergrouplist", "servergroupsbyclientid"),
+    "channelgroupadd": ("channelgrouplist",),
+    "channelgroupcopy": ("channelgrouplist",),
+    "channelgroupdel": ("channelgrouplist",),
+    "channelgrouprename": ("channelgrouplist",),
+    "clientedit": ("clientgetnamefromdbid", "clientgetnamefromuid"),
+    "clientdbedit": ("clientgetnamefromdbid", "clientgetnamefromuid"),
+    "clientdbdelete": ("clientgetdbidfromuid", "clientgetnamefromdbid", "clientgetnamefromuid"),
+    "serveredit": ("serverinfo",),
+}
+"""Commands whose cached responses are dropped when sending each command."""
+
+
+class CacheStats(NamedTuple):
+    size: int  #: Responses currently cached.
+    hits: int  #: Queries answered from the cache.
+    misses: int  #: Cacheable queries sent to the server.
+
+
+class _Entry(NamedTuple):
+    command: str
+    expires: float
+    response: response.TSResponse
+
+
+class ResponseCache:
+    """
+    Caches the responses of read-only queries.
+
+    Responses are cached by the compiled query, for the time set for the command of the query.
+    Commands without a time set are not cached.
+    Once the cache is full, the least recently used response is dropped.
+
+    Cached responses are dropped on server notifications and on queries that change them.
+    """
+
+    CLEAR_EVENTS: tuple[str, ...] = ("disconnect", "reconnect")
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        max_size: int = 1024,
+        event_invalidations: Mapping[str, Collection[str]] | None = None,
+        query_invalidations: Mapping[str, Collection[str]] | None = None,
+        compact: bool = False,
+    ) -> None:
+        """
+        :param ttls: Seconds the responses of each command are cached for.
+        :param max_size: Maximum amount of responses cached.
+        :param event_invalidations: Commands dropped from the cache on each event.
+        :param query_invalidations: Commands dropped from the cache when sending each command.
+        :param compact: Store the responses as :class:`~tsbot.response.CompactTSResponse`. Their rows are read-only.
+        """  # noqa: D205
+        self._ttls = DEFAULT_TTLS if ttls is None else ttls
+        self._max_size = max_size
+        self._compact = compact
+
+        self.event_invalidations = (
+            DEFAULT_EVENT_INVALIDATIONS if event_invalidations is None else event_invalidations
+        )
+        self.query_invalidations = (
+            DEFAULT_QUERY_INVALIDATIONS if query_invalidations is None else query_invalidations
+        )
+
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+        # Incremented on every invalidation. Responses to queries sent
+        # before an invalidation might be stale and are not cached.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(size=len(self._entries), hits=self._hits, misses=self._misses)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def cacheable(self, raw_query: str) -> bool:
+        return commands.get_command(raw_query) in self._ttls
+
+    def get(self, raw_query: str) -> response.TSResponse | None:
+        """Get the cached response to a query, if any."""
+        if not (entry := self._entries.get(raw_query)):
+            if self.cacheable(raw_query):
+                self._misses += 1
+            return None
+
+        if entry.expires <= time.monotonic():
+            del self._entries[raw_query]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(raw_query)
+        self._hits += 1
+        return entry.response
+
+    def put(
+        self, raw_query: str, response: response.TSResponse, generation: int | None = None
+    ) -> None:
+        """
+        Cache the response to a query, if the command of the query is cached.
+
+        :param generation: :attr:`generation` when the query was sent.
+            The response is not cached if the cache has been invalidated since.
+        """
+        command = commands.get_command(raw_query)
+        if (ttl := self._ttls.get(command)) is None:
+            return
+
+        if generation is not None and generation != self._generation:
+            return
+
+        if self._compact:
+            response = response.compact()
+
+        self._entries[raw_query] = _Entry(command, time.monotonic() + ttl, response)
+        self._entries.move_to_end(raw_query)
+
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, command_names: Iterable[str]) -> None:
+        """Drop the cached responses of the given commands."""
+        command_names = set(command_names)
+        self._generation += 1
+
+        for raw_query in [q for q, e in self._entries.items() if e.command in command_names]:
+            del self._entries[raw_query]
+
+    def invalidate_after_query(self, raw_query: str) -> None:
+        """Drop the cached responses changed by the query."""
+        if invalidated := self.query_invalidations.get(commands.get_command(raw_query)):
+            self.invalidate(invalidated)
+
+    def invalidate_after_event(self, event: str) -> None:
+        """Drop the cached responses changed by the event."""
+        if event in self.CLEAR_EVENTS:
+            self.clear()
+            return
+
+        if invalidated := self.event_invalidations.get(event):
+            logger.debug("Dropping cached %s after %r", ", ".join(invalidated), event)
+            self.invalidate(invalidated)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import array
+import importlib
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+
+class TSColumns(Mapping[str, list[str]]):
+    """
+    Columnar view of response rows.
+
+    Maps a field name to the values of the field in every row, in the order of the rows.
+    Rows without the field have an empty string as the value.
+    Columns are built on first access.
+    """
+
+    __slots__ = ("_columns", "_keys", "_rows")
+
+    def __init__(self, rows: Sequence[Mapping[str, str]]) -> None:
+        """:param rows: Rows of the response."""
+        self._rows = rows
+        self._columns: dict[str, list[str]] = {}
+        self._keys: dict[str, None] | None = None
+
+    @property
+    def _fields(self) -> dict[str, None]:
+        if self._keys is None:
+            self._keys = dict.fromkeys(key for row in self._rows for key in row)
+
+        return self._keys
+
+    def __getitem__(self, key: str) -> list[str]:
+        if (column := self._columns.get(key)) is None:
+            if key not in self._fields:
+                raise KeyError(key)
+
+            column = self._columns[key] = [row.get(key, "") for row in self._rows]
+
+        return column
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def ints(self, key: str, default: int = 0) -> array.array[int]:
+        """
+        Values of a field as integers.
+
+        :param key: Name of the field.
+        :param default: Value for rows without a value for the field.
+        """
+        return array.array("q", (int(value) if value else default for value in self[key]))
+
+    def numpy(self, key: str, default: int = 0) -> Any:
+        """
+        Values of a field as a NumPy integer array, for vectorized operations.
+
+        Needs NumPy to be installed.
+
+        :param key: Name of the field.
+        :param default: Value for rows without a value for the field.
+        """
+        try:
+            np = importlib.import_module("numpy")
+        except ImportError as e:
+            raise ImportError("NumPy arrays need NumPy, install it with 'pip install numpy'") from e
+
+        return np.frombuffer(self.ints(key, default), dtype=np.int64)
+
+    def select(self, mask: Iterable[Any]) -> list[Mapping[str, str]]:
+        """
+        Rows where `mask` is true.
+
+        :param mask: Truth value for each row. Can be a NumPy boolean array.
+        """
+        return [row for row, selected in zip(self._rows, mask) if selected]
@@ -1,4 +1,5 @@
 from tsbot.connection.connection import TSConnection
 from tsbot.connection.connection_types import RawConnection, SSHConnection, abc
+from tsbot.connection.pool import TSConnectionPool
 
-__all__ = ("RawConnection", "SSHConnection", "TSConnection", "abc")
+__all__ = ("RawConnection", "SSHConnection", "TSConnection", "TSConnectionPool", "abc")
@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import itertools
 import logging
-from collections.abc import Callable, Iterable
+import re
+from collections.abc import AsyncGenerator, Callable, Collection, Iterable
 from typing import TYPE_CHECKING, Any
 
 import tsbot.logging
-from tsbot import context, events, exceptions, query_builder, response, utils
-from tsbot.connection import reader, writer
+from tsbot import context, enums, events, exceptions, query_builder, response, utils
+from tsbot.connection import priority_lock, reader, single_flight, writer
+from tsbot.events import event_types
+from tsbot.query_builder import commands
 
 if TYPE_CHECKING:
     from tsbot import connection, ratelimiter
@@ -17,6 +21,21 @@ if TYPE_CHECKING:
 
 logger = tsbot.logging.get_logger(__name__)
 
+FLOOD_ERROR_ID = 524
+DEFAULT_FLOOD_WAIT: float = 1
+
+_FLOOD_WAIT_PATTERN = re.compile(r"wait (\d+) second")
+
+
+def _flood_wait(response: response.TSResponse) -> float:
+    """Parse the time the server requires to wait from a flood error."""
+    extra_msg = response.last.get("extra_msg", "") if response.data else ""
+
+    if match := _FLOOD_WAIT_PATTERN.search(extra_msg):
+        return float(match.group(1))
+
+    return DEFAULT_FLOOD_WAIT
+
 
 class TSConnection:
     def __init__(
@@ -30,12 +49,25 @@ class TSConnection:
         connection_retry_interval: float = 10,
         query_timeout: float = 5,
         ratelimiter: ratelimiter.RateLimiter | None = None,
+        antiflood: ratelimiter.AntiFloodLimiter | None = None,
+        pipelined: bool = False,
+        register_notifications: bool = True,
+        flood_retries: int = 3,
+        deduplicate_queries: bool = False,
+        events_not_full: asyncio.Event | None = None,
+        lazy_responses: bool = False,
     ) -> None:
         self._event_emitter = event_emitter
         self._connection = connection
 
         self._server_id = server_id
         self._nickname = nickname
+        self._register_notifications = register_notifications
+
+        self._notification_classes = frozenset(event_types.NOTIFICATION_EVENTS)
+        self._registered_classes: frozenset[str] = frozenset()
+        self._notification_lock = asyncio.Lock()
+        self._notification_task: asyncio.Task[None] | None = None
 
         self._retries = max(connection_retries, 1)
         self._retry_interval = connection_retry_interval
@@ -44,13 +76,20 @@ class TSConnection:
         self._connected_event = asyncio.Event()
         self._is_first_connection = True
 
-        self._sending_lock = asyncio.Lock()
+        self._sending_lock = priority_lock.PriorityLock()
+        self._pipelined = pipelined
+        self._flood_retries = flood_retries
+        self._lazy_responses = lazy_responses
+        self._single_flight: single_flight.SingleFlight[response.TSResponse] | None = (
+            single_flight.SingleFlight() if deduplicate_queries else None
+        )
 
         self._reader = reader.Reader(
             self._connection,
             on_notify=self._on_notify,
             ready_to_read=self._connected_event,
             read_timeout=query_timeout,
+            events_not_full=events_not_full,
         )
 
         self._writer = writer.Writer(
@@ -58,7 +97,9 @@ class TSConnection:
             ratelimiter=ratelimiter,
             on_send=self._on_send,
             ready_to_write=self._connected_event,
+            antiflood=antiflood,
         )
+        self._antiflood = antiflood
 
         self._closed = False
 
@@ -118,6 +159,9 @@ class TSConnection:
                     logger.info("Connection established")
                     break
 
+                if self._closed:
+                    raise ConnectionAbortedError("Connection closed while connecting")
+
                 if attempt >= self._retries:
                     raise ConnectionRefusedError(
                         f"Failed to connect after {self._retries} attempt"
@@ -136,44 +180,172 @@ class TSConnection:
 
             await self.send(select_query)
 
-        async def register_notifications() -> None:
-            """Register server to send events to the bot."""
-            notify_query = query_builder.TSQuery("servernotifyregister")
-
-            await self.send(notify_query.params(event="channel", id=0))
-            for event in ("server", "textserver", "textchannel", "textprivate"):
-                await self.send(notify_query.params(event=event))
+        async def configure_antiflood(antiflood: ratelimiter.AntiFloodLimiter) -> None:
+            """Read the anti-flood settings of the selected virtual server."""
+            try:
+                info = await self.send(query_builder.TSQuery("serverinfo"))
+            except exceptions.TSResponseError as e:
+                logger.warning("Failed to read anti-flood settings, not limiting queries: %s", e)
+                return
+
+            antiflood.configure(
+                points_tick_reduce=int(info["virtualserver_antiflood_points_tick_reduce"]),
+                points_needed_command_block=int(
+                    info["virtualserver_antiflood_points_needed_command_block"]
+                ),
+            )
 
         while not self._closed:
-            await connect()
+            try:
+                await connect()
+
+                logger.debug("Validating server header")
+                await self._connection.validate_header()
+
+                logger.debug("Authenticating connection")
+                await self._connection.authenticate()
 
-            logger.debug("Validating server header")
-            await self._connection.validate_header()
+                with utils.set_event(self._connected_event), self._reader:
+                    await select_server()
 
-            logger.debug("Authenticating connection")
-            await self._connection.authenticate()
+                    if self._antiflood:
+                        await configure_antiflood(self._antiflood)
 
-            with utils.set_event(self._connected_event), self._reader:
-                await select_server()
-                await register_notifications()
+                    if self._register_notifications:
+                        self._registered_classes = frozenset()
+                        await self._sync_notifications()
 
-                if not self._is_first_connection:
-                    self._event_emitter(events.TSEvent("reconnect"))
-                self._is_first_connection = False
+                    if not self._is_first_connection:
+                        self._event_emitter(events.TSEvent("reconnect"))
+                    self._is_first_connection = False
 
-                self._event_emitter(events.TSEvent("connect"))
+                    self._event_emitter(events.TSEvent("connect"))
 
-                with contextlib.suppress(ConnectionError):
-                    await self._connection.wait_closed()
+                    with contextlib.suppress(ConnectionError):
+                        await self._connection.wait_closed()
+
+            except ConnectionError:
+                # Closing the connection while (re)connecting is not an error
+                if not self._closed:
+                    raise
+                break
 
             self._event_emitter(events.TSEvent("disconnect"))
 
-    async def send(self, query: query_builder.TSQuery) -> response.TSResponse:
-        return await self.send_raw(query.compile())
+    def set_notification_classes(self, notification_classes: Collection[str]) -> None:
+        """
+        Set the notification classes the server sends to the bot.
+
+        If connected, the registrations on the server are updated in the background.
+        """
+        self._notification_classes = frozenset(notification_classes)
+
+        if not self._register_notifications or not self.connected or self._notification_task:
+            return
+
+        self._notification_task = asyncio.create_task(
+            self._notification_sync_task(), name="SyncNotifications-Task"
+        )
+
+    async def _notification_sync_task(self) -> None:
+        try:
+            await self._sync_notifications()
+        finally:
+            # Cleared without yielding to the event loop after the last check of
+            # the wanted classes, so no change set in between is missed.
+            self._notification_task = None
+
+    async def _sync_notifications(self) -> None:
+        """Register the server to send the notification classes set."""
+        notify_query = query_builder.TSQuery("servernotifyregister")
+
+        async with self._notification_lock:
+            try:
+                while (wanted := self._notification_classes) != self._registered_classes:
+                    # Registrations can only be removed all at once
+                    if self._registered_classes - wanted:
+                        await self.send(query_builder.TSQuery("servernotifyunregister"))
+                        self._registered_classes = frozenset()
+
+                    for notification_class in sorted(wanted - self._registered_classes):
+                        query = notify_query.params(event=notification_class)
+                        if notification_class == "channel":
+                            query = query.params(id=0)
+
+                        await self.send(query)
+                        self._registered_classes |= {notification_class}
+
+            except (exceptions.TSResponseError, ConnectionError) as e:
+                logger.warning("Failed to register notifications: %s", e)
+            else:
+                logger.debug("Registered notifications: %s", ", ".join(sorted(wanted)))
+
+    def _on_flood(self, raw_query: str, wait: float) -> None:
+        logger.warning("Server reported flooding, pausing queries for %ss", wait)
+
+        self._writer.pause(wait)
+        self._event_emitter(
+            events.TSEvent("flood", context.TSCtx({"query": raw_query, "wait": str(wait)}))
+        )
+
+    async def send(
+        self,
+        query: query_builder.TSQuery,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
+        return await self.send_raw(query.compile(), idempotent=idempotent, priority=priority)
+
+    async def send_raw(
+        self,
+        raw_query: str,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
+        """
+        Send a raw query and wait for the response.
+
+        On a flood error, writing is paused for the time the server requires.
+        Idempotent queries are retried after the pause. Read-only queries are idempotent by default.
+
+        If deduplicating queries, identical read-only queries in flight share the same response.
+        """
+        if self._single_flight and idempotent is not False and commands.is_read_only(raw_query):
+            return await self._single_flight.do(
+                raw_query, lambda: self._send_raw(raw_query, True, priority)
+            )
+
+        if idempotent is None:
+            idempotent = commands.is_read_only(raw_query)
+
+        return await self._send_raw(raw_query, idempotent, priority)
+
+    async def _send_raw(
+        self, raw_query: str, idempotent: bool, priority: enums.QueryPriority
+    ) -> response.TSResponse:
+        attempt = 0
+        while True:
+            try:
+                return self._check_response(raw_query, await self._send(raw_query, priority))
+            except exceptions.TSResponseFloodError:
+                if not idempotent or attempt >= self._flood_retries:
+                    raise
+
+            attempt += 1
+            logger.debug("Retrying flooded query [%d/%d]", attempt, self._flood_retries)
 
-    async def send_raw(self, raw_query: str) -> response.TSResponse:
-        async with self._sending_lock:
-            response = await self._send(raw_query)
+    def _check_response(self, raw_query: str, response: response.TSResponse) -> response.TSResponse:
+        """Raise the error the server responded with, if any."""
+        if response.error_id == FLOOD_ERROR_ID:
+            self._on_flood(raw_query, wait := _flood_wait(response))
+
+            raise exceptions.TSResponseFloodError(
+                msg=response.msg,
+                error_id=response.error_id,
+                retry_after=wait,
+            )
 
         if response.error_id == 2568:
             raise exceptions.TSResponsePermissionError(
@@ -191,38 +363,133 @@ class TSConnection:
         return response
 
     @utils.time_coroutine(logger, logging.DEBUG, "Query took %.5f seconds to execute")
-    async def _send(self, raw_query: str) -> response.TSResponse:
+    async def _send(self, raw_query: str, priority: enums.QueryPriority) -> response.TSResponse:
         if self._closed:
             raise BrokenPipeError("Connection to the TeamSpeak server is closed")
 
-        await self._writer.write(raw_query)
+        # In pipelined mode, the lock only keeps the writes in order.
+        # Responses are paired with the queries by the reader.
+        async with self._sending_lock(priority):
+            response_data = await self._write(raw_query)
+            if not self._pipelined:
+                return await self._read(response_data)
+
+        return await self._read(response_data)
+
+    async def _write(self, raw_query: str) -> asyncio.Future[tuple[str, ...]]:
+        response_data: asyncio.Future[tuple[str, ...]] = asyncio.get_running_loop().create_future()
 
         try:
-            response_data = await self._reader.read_response()
+            await self._writer.write(
+                raw_query, on_write=functools.partial(self._reader.track_response, response_data)
+            )
         except BaseException:
-            self._reader.skip_response()
+            response_data.cancel()
             raise
 
-        return response.TSResponse.from_server_response(response_data)
+        return response_data
 
-    async def send_batched(self, queries: Iterable[query_builder.TSQuery]) -> None:
-        await self.send_batched_raw(query.compile() for query in queries)
+    async def _read(self, response_data: asyncio.Future[tuple[str, ...]]) -> response.TSResponse:
+        return response.TSResponse.from_server_response(
+            await self._reader.read_response(response_data), lazy=self._lazy_responses
+        )
+
+    def send_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        return self.send_many_raw((query.compile() for query in queries), priority=priority)
 
-    async def send_batched_raw(self, raw_queries: Iterable[str]) -> None:
-        async with self._sending_lock:
-            await self._send_batched(raw_queries)
+    async def send_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        """
+        Send multiple queries without waiting for the responses in between.
 
-    @utils.time_coroutine(logger, logging.DEBUG, "Batch query took %.5f seconds to execute")
-    async def _send_batched(self, raw_queries: Iterable[str]) -> None:
+        Yields the response or the error of each query, in the same order as the queries.
+        The queries are written in batches while the responses are being read.
+        """
         if self._closed:
             raise BrokenPipeError("Connection to the TeamSpeak server is closed")
 
-        queries_sent = 0
+        written: asyncio.Queue[tuple[str, asyncio.Future[tuple[str, ...]]] | None] = asyncio.Queue()
+
+        async def write_batches() -> None:
+            loop = asyncio.get_running_loop()
+
+            try:
+                for batch in self._writer.batches(raw_queries):
+                    responses = [(raw_query, loop.create_future()) for raw_query in batch]
+
+                    def track_responses(_: int) -> None:
+                        for item in responses:
+                            self._reader.track_response(item[1])
+                            written.put_nowait(item)
+
+                    async with self._sending_lock(priority):
+                        await self._writer.write_many(batch, on_write=track_responses)
+            finally:
+                written.put_nowait(None)
+
+        write_task = asyncio.create_task(write_batches(), name="SendMany-Task")
 
         try:
-            for raw_query in raw_queries:
-                await self._writer.write(raw_query)
-                queries_sent += 1
+            while item := await written.get():
+                yield await self._read_result(*item, priority)
+
+            await write_task
 
         finally:
-            self._reader.skip_response(queries_sent)
+            write_task.cancel()
+
+            # Responses to the queries not read are skipped
+            while not written.empty():
+                if item := written.get_nowait():
+                    item[1].cancel()
+
+    async def _read_result(
+        self,
+        raw_query: str,
+        response_data: asyncio.Future[tuple[str, ...]],
+        priority: enums.QueryPriority,
+    ) -> response.TSResponse | exceptions.TSResponseError:
+        try:
+            try:
+                return self._check_response(raw_query, await self._read(response_data))
+            except exceptions.TSResponseFloodError:
+                if not commands.is_read_only(raw_query) or not self._flood_retries:
+                    raise
+
+            return await self.send_raw(raw_query, priority=priority)
+
+        except exceptions.TSResponseError as e:
+            return e
+
+    async def send_batched(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
+        await self.send_batched_raw((query.compile() for query in queries), priority=priority)
+
+    @utils.time_coroutine(logger, logging.DEBUG, "Batch query took %.5f seconds to execute")
+    async def send_batched_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
+        if self._closed:
+            raise BrokenPipeError("Connection to the TeamSpeak server is closed")
+
+        # The queries are written in batches. The lock is released between the batches,
+        # so higher priority queries can get in between.
+        for batch in self._writer.batches(raw_queries):
+            async with self._sending_lock(priority):
+                await self._writer.write_many(batch, on_write=self._reader.skip_response)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 
 class Connection(ABC):
@@ -51,6 +52,16 @@ class Connection(ABC):
         This method must terminate data with line ending.
         """
 
+    async def write_many(self, data: Sequence[str]) -> None:
+        """
+        Write multiple lines of data to the server.
+
+        Each line must be terminated with line ending.
+        Connections should override this method to write all the lines at once.
+        """
+        for line in data:
+            await self.write(line)
+
     @abstractmethod
     async def readline(self) -> str | None:
         """
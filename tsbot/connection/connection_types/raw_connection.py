@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Sequence
 
 from typing_extensions import override
 
@@ -68,6 +69,14 @@ class RawConnection(abc.Connection):
         self._writer.write(f"{data}{self.LINE_ENDING}".encode())
         await self._writer.drain()
 
+    @override
+    async def write_many(self, data: Sequence[str]) -> None:
+        if not self._writer or self._writer.is_closing():
+            raise BrokenPipeError("Trying to write on a closed connection")
+
+        self._writer.write("".join(f"{line}{self.LINE_ENDING}" for line in data).encode())
+        await self._writer.drain()
+
     @override
     async def readline(self) -> str | None:
         if not self._reader:
@@ -1,11 +1,67 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+from collections.abc import Sequence
+
 import asyncssh
-from typing_extensions import override
+from typing_extensions import Self, override
 
 from tsbot.connection.connection_types import abc
 
 
+class _SSHTransport:
+    """SSH connection shared between query sessions."""
+
+    def __init__(self, username: str, password: str, address: str, port: int) -> None:
+        self._username = username
+        self._password = password
+        self._address = address
+        self._port = port
+
+        self._connection: asyncssh.SSHClientConnection | None = None
+        self._connecting = asyncio.Lock()
+        self._users = 0
+
+    async def open_session(
+        self,
+    ) -> tuple[asyncssh.SSHWriter[str], asyncssh.SSHReader[str]]:
+        """Opens a new session, connecting to the server if needed."""
+        async with self._connecting:
+            if self._connection is None or self._connection.is_closed():
+                self._connection = await asyncssh.connect(
+                    host=self._address,
+                    port=self._port,
+                    username=self._username,
+                    password=self._password,
+                    known_hosts=None,
+                    preferred_auth="password",
+                )
+
+        if self._users <= 0:
+            # Every query session was closed while connecting
+            self._connection.close()
+            raise ConnectionAbortedError("Query sessions closed while connecting")
+
+        writer, reader, _ = await self._connection.open_session()  # type: ignore
+        return writer, reader  # type: ignore
+
+    def acquire(self) -> None:
+        self._users += 1
+
+    def release(self) -> None:
+        """Closes the connection once no query sessions are using it."""
+        self._users -= 1
+
+        if self._users <= 0 and self._connection:
+            self._connection.close()
+
+    async def wait_closed(self) -> None:
+        """Awaits until the connection is closed, if no query sessions are using it."""
+        if self._users <= 0 and self._connection:
+            await self._connection.wait_closed()
+
+
 class SSHConnection(abc.Connection):
     def __init__(
         self,
@@ -14,27 +70,31 @@ class SSHConnection(abc.Connection):
         address: str,
         port: int,
     ) -> None:
-        self._username = username
-        self._password = password
-        self._address = address
-        self._port = port
+        self._transport = _SSHTransport(username, password, address, port)
+        self._acquired = False
 
-        self._connection: asyncssh.SSHClientConnection | None = None
         self._writer: asyncssh.SSHWriter[str] | None = None
         self._reader: asyncssh.SSHReader[str] | None = None
 
+    def open_channel(self) -> Self:
+        """
+        Creates a new query session sharing the same SSH connection.
+
+        The session is opened as a separate channel, without a new key exchange and authentication.
+        The SSH connection is closed once all the sessions sharing it are closed.
+        """
+        channel = copy.copy(self)
+        channel._acquired = False
+        channel._writer = channel._reader = None
+        return channel
+
     @override
     async def connect(self) -> None:
-        self._connection = await asyncssh.connect(
-            host=self._address,
-            port=self._port,
-            username=self._username,
-            password=self._password,
-            known_hosts=None,
-            preferred_auth="password",
-        )
+        if not self._acquired:
+            self._transport.acquire()
+            self._acquired = True
 
-        self._writer, self._reader, _ = await self._connection.open_session()  # type: ignore
+        self._writer, self._reader = await self._transport.open_session()
 
     @override
     async def validate_header(self) -> None:
@@ -51,16 +111,17 @@ class SSHConnection(abc.Connection):
         if self._writer:
             self._writer.close()
 
-        if self._connection:
-            self._connection.close()
+        if self._acquired:
+            self._acquired = False
+            self._transport.release()
 
     @override
     async def wait_closed(self) -> None:
-        if not self._writer or not self._connection:
+        if not self._writer:
             raise ConnectionError("Trying to wait on uninitialized connection")
 
         await self._writer.wait_closed()
-        await self._connection.wait_closed()
+        await self._transport.wait_closed()
 
     @override
     async def write(self, data: str) -> None:
@@ -70,6 +131,14 @@ class SSHConnection(abc.Connection):
         self._writer.write(f"{data}{self.LINE_ENDING}")
         await self._writer.drain()
 
+    @override
+    async def write_many(self, data: Sequence[str]) -> None:
+        if not self._writer or self._writer.is_closing():
+            raise BrokenPipeError("Trying to write on a closed connection")
+
+        self._writer.write("".join(f"{line}{self.LINE_ENDING}" for line in data))
+        await self._writer.drain()
+
     @override
     async def readline(self) -> str | None:
         if not self._reader:
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import time
+from collections.abc import AsyncGenerator, Collection, Iterable, Sequence
+from typing import TYPE_CHECKING, Any
+
+import tsbot.logging
+from tsbot import enums
+from tsbot.connection import single_flight
+from tsbot.query_builder import commands
+
+if TYPE_CHECKING:
+    from tsbot import connection, exceptions, query_builder, response
+
+
+logger = tsbot.logging.get_logger(__name__)
+
+
+class TSConnectionPool:
+    """
+    Multiple query sessions behind one interface.
+
+    The primary session handles notifications and every query that changes state.
+    Read-only queries are balanced between all the connected sessions.
+    """
+
+    KEEP_ALIVE_INTERVAL: float = 4 * 60  # 4 minutes
+    KEEP_ALIVE_COMMAND: str = "version"
+
+    def __init__(
+        self,
+        primary: connection.TSConnection,
+        secondaries: Sequence[connection.TSConnection],
+        deduplicate_queries: bool = False,
+    ) -> None:
+        self._primary = primary
+        self._secondaries = tuple(secondaries)
+
+        self._single_flight: single_flight.SingleFlight[response.TSResponse] | None = (
+            single_flight.SingleFlight() if deduplicate_queries else None
+        )
+
+        self._in_flight: collections.Counter[connection.TSConnection] = collections.Counter()
+        self._last_used = dict.fromkeys(self._secondaries, time.monotonic())
+
+        self._keep_alive_task: asyncio.Task[None] | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._primary.connected
+
+    def __enter__(self) -> None:
+        self.connect()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        self._primary.connect()
+
+        for secondary in self._secondaries:
+            secondary.connect()
+
+        if self._secondaries:
+            self._keep_alive_task = asyncio.create_task(
+                self._keep_alive(), name="PoolKeepAlive-Task"
+            )
+
+    def close(self) -> None:
+        if self._keep_alive_task:
+            self._keep_alive_task.cancel()
+
+        for session in (self._primary, *self._secondaries):
+            session.close()
+
+    async def wait_closed(self) -> None:
+        try:
+            await self._primary.wait_closed()
+        finally:
+            for secondary in self._secondaries:
+                secondary.close()
+
+                try:
+                    await secondary.wait_closed()
+                except Exception as e:
+                    logger.warning("Secondary query session closed with an error: %s", e)
+
+    def set_notification_classes(self, notification_classes: Collection[str]) -> None:
+        """Notifications are only sent to the primary session."""
+        self._primary.set_notification_classes(notification_classes)
+
+    def _select_session(self) -> connection.TSConnection:
+        """Select the connected session with the least queries in flight."""
+        return min(
+            (s for s in (*self._secondaries, self._primary) if s.connected),
+            key=self._in_flight.__getitem__,
+            default=self._primary,
+        )
+
+    async def _send_with(
+        self,
+        session: connection.TSConnection,
+        raw_query: str,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
+        self._in_flight[session] += 1
+        self._last_used[session] = time.monotonic()
+
+        try:
+            return await session.send_raw(raw_query, idempotent=idempotent, priority=priority)
+        finally:
+            self._in_flight[session] -= 1
+
+    async def send(
+        self,
+        query: query_builder.TSQuery,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
+        return await self.send_raw(query.compile(), idempotent=idempotent, priority=priority)
+
+    async def send_raw(
+        self,
+        raw_query: str,
+        *,
+        idempotent: bool | None = None,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> response.TSResponse:
+        if not commands.is_read_only(raw_query):
+            return await self._primary.send_raw(raw_query, idempotent=idempotent, priority=priority)
+
+        if self._single_flight and idempotent is not False:
+            return await self._single_flight.do(
+                raw_query, lambda: self._send_balanced(raw_query, idempotent, priority)
+            )
+
+        return await self._send_balanced(raw_query, idempotent, priority)
+
+    async def _send_balanced(
+        self, raw_query: str, idempotent: bool | None, priority: enums.QueryPriority
+    ) -> response.TSResponse:
+        session = self._select_session()
+        if session is self._primary:
+            return await self._send_with(session, raw_query, idempotent, priority)
+
+        try:
+            return await self._send_with(session, raw_query, idempotent, priority)
+        except ConnectionError as e:
+            logger.warning("Secondary query session failed, retrying on primary: %s", e)
+
+        return await self._send_with(self._primary, raw_query, idempotent, priority)
+
+    def send_many(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        return self._primary.send_many(queries, priority=priority)
+
+    def send_many_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.NORMAL,
+    ) -> AsyncGenerator[response.TSResponse | exceptions.TSResponseError, None]:
+        return self._primary.send_many_raw(raw_queries, priority=priority)
+
+    async def send_batched(
+        self,
+        queries: Iterable[query_builder.TSQuery],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
+        await self._primary.send_batched(queries, priority=priority)
+
+    async def send_batched_raw(
+        self,
+        raw_queries: Iterable[str],
+        *,
+        priority: enums.QueryPriority = enums.QueryPriority.BULK,
+    ) -> None:
+        await self._primary.send_batched_raw(raw_queries, priority=priority)
+
+    async def _keep_alive(self) -> None:
+        """
+        Task to keep the secondary sessions alive.
+
+        The primary session is kept alive by the bot.
+        """
+        while True:
+            next_keep_alive = (
+                min(self._last_used[s] for s in self._secondaries) + self.KEEP_ALIVE_INTERVAL
+            )
+            await asyncio.sleep(next_keep_alive - time.monotonic())
+
+            for secondary in self._secondaries:
+                if time.monotonic() - self._last_used[secondary] < self.KEEP_ALIVE_INTERVAL:
+                    continue
+
+                if not secondary.connected:
+                    self._last_used[secondary] = time.monotonic()
+                    continue
+
+                with contextlib.suppress(Exception):
+                    await self._send_with(secondary, self.KEEP_ALIVE_COMMAND)
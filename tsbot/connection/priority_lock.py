@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+from collections.abc import AsyncGenerator
+
+from tsbot import enums
+
+
+class PriorityLock:
+    """
+    Lock that is handed to the highest priority waiter first.
+
+    Waiters with the same priority get the lock in the order they started waiting.
+    To keep lower priorities from starving, a priority that has been passed over
+    `starvation_limit` times in a row gets the lock next.
+    """
+
+    def __init__(self, starvation_limit: int = 10) -> None:
+        self._starvation_limit = starvation_limit
+
+        self._locked = False
+        self._waiters: dict[enums.QueryPriority, collections.deque[asyncio.Future[None]]] = {
+            priority: collections.deque() for priority in enums.QueryPriority
+        }
+        self._passed_over = dict.fromkeys(enums.QueryPriority, 0)
+
+    def locked(self) -> bool:
+        return self._locked
+
+    @contextlib.asynccontextmanager
+    async def __call__(
+        self, priority: enums.QueryPriority = enums.QueryPriority.NORMAL
+    ) -> AsyncGenerator[None, None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: enums.QueryPriority = enums.QueryPriority.NORMAL) -> None:
+        if not self._locked:
+            self._locked = True
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._waiters[priority].remove(waiter)
+            else:
+                # The lock was already handed to us
+                self.release()
+            raise
+
+    def release(self) -> None:
+        if not self._locked:
+            raise RuntimeError("Lock is not acquired")
+
+        self._locked = False
+
+        waiting = [priority for priority, waiters in self._waiters.items() if waiters]
+        if not waiting:
+            return
+
+        starving = [p for p in waiting if self._passed_over[p] >= self._starvation_limit]
+        next_priority = (starving or waiting)[0]
+
+        for priority in waiting:
+            self._passed_over[priority] += 1
+        self._passed_over[next_priority] = 0
+
+        self._locked = True
+        self._waiters[next_priority].popleft().set_result(None)
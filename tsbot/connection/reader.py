@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import collections
 import contextlib
+import itertools
 from collections.abc import AsyncGenerator, Callable
 from typing import TYPE_CHECKING, Any
 
@@ -16,56 +17,45 @@ logger = tsbot.logging.get_logger(__name__)
 
 
 class _ResponseBuffer:
-    def __init__(self) -> None:
-        self._deque: collections.deque[tuple[str, ...]] = collections.deque()
-        self._getters: collections.deque[asyncio.Future[None]] = collections.deque()
+    """
+    Pairs responses from the server with the queries waiting for them.
+
+    ServerQuery answers queries in the order they were sent, so each response
+    resolves the oldest waiter. Waiters that are no longer interested in their response
+    (cancelled or timed out) still consume it, keeping the pairing in sync.
+    """
 
-    def _wakeup_getters(self) -> None:
-        while self._getters:
-            getter = self._getters.popleft()
-            if not getter.done():
-                getter.set_result(None)
-                break
+    def __init__(self) -> None:
+        self._waiters: collections.deque[asyncio.Future[tuple[str, ...]] | None] = (
+            collections.deque()
+        )
 
     def __len__(self) -> int:
-        return len(self._deque)
+        return len(self._waiters)
 
     def __bool__(self) -> bool:
-        return bool(self._deque)
+        return bool(self._waiters)
 
-    def clear(self) -> None:
-        self._deque.clear()
+    def track(self, waiter: asyncio.Future[tuple[str, ...]]) -> None:
+        self._waiters.append(waiter)
 
-    async def discard(self, count: int = 1) -> None:
-        for _ in range(count):
-            await self.pop()
-
-    async def _wakeup_on_available_item(self) -> None:
-        while not self:
-            getter = asyncio.get_running_loop().create_future()
-            self._getters.append(getter)
-
-            try:
-                await getter
+    def skip(self, count: int = 1) -> None:
+        self._waiters.extend(itertools.repeat(None, count))
 
-            except Exception:
-                getter.cancel()
-
-                with contextlib.suppress(ValueError):
-                    self._getters.remove(getter)
-
-                if self and not getter.cancelled():
-                    self._wakeup_getters()
-
-                raise
+    def put(self, item: tuple[str, ...]) -> None:
+        if not self._waiters:
+            logger.warning("Received a response without a query waiting for it: %r", item)
+            return
 
-    async def pop(self) -> tuple[str, ...]:
-        await self._wakeup_on_available_item()
-        return self._deque.popleft()
+        waiter = self._waiters.popleft()
+        if waiter is not None and not waiter.done():
+            waiter.set_result(item)
 
-    def put(self, item: tuple[str, ...]) -> None:
-        self._deque.append(item)
-        self._wakeup_getters()
+    def close(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(ConnectionResetError("Connection closed before a response"))
 
 
 class Reader:
@@ -75,14 +65,15 @@ class Reader:
         on_notify: Callable[[str], None],
         read_timeout: float,
         ready_to_read: asyncio.Event,
+        events_not_full: asyncio.Event | None = None,
     ) -> None:
         self._connection = connection
         self._ready_to_read = ready_to_read
+        self._events_not_full = events_not_full
+        self._response_tracked = asyncio.Event()
         self._on_notify = on_notify
         self._read_timeout = read_timeout
 
-        self._skipped_responses = 0
-
         self._response_buffer = _ResponseBuffer()
         self._reader_task: asyncio.Task[None] | None = None
 
@@ -92,23 +83,63 @@ class Reader:
     def __exit__(self, *exc: Any) -> None:
         self.close()
 
+    def track_response(self, response: asyncio.Future[tuple[str, ...]]) -> None:
+        """
+        Resolve `response` with the next unclaimed response from the server.
+
+        Has to be called in the same order the queries are written.
+        """
+        self._response_buffer.track(response)
+        self._response_tracked.set()
+
     def skip_response(self, count: int = 1) -> None:
-        self._skipped_responses += count
+        """Discard the next `count` unclaimed responses from the server."""
+        self._response_buffer.skip(count)
+        self._response_tracked.set()
 
     def start(self) -> None:
         self._reader_task = asyncio.create_task(self._task(), name="Reader-Task")
 
     def close(self) -> None:
-        self._response_buffer.clear()
+        self._response_buffer.close()
 
         if self._reader_task:
             self._reader_task.cancel()
 
         self._reader_task = None
 
+    async def _wait_for_event_room(self) -> bool:
+        """
+        Hold reading while the event queue is full.
+
+        Reading continues while responses are expected, so handlers
+        waiting for a response don't deadlock with the reader.
+        """
+        if not self._events_not_full:
+            return True
+
+        while not self._events_not_full.is_set() and not self._response_buffer:
+            self._response_tracked.clear()
+
+            waiters = (
+                asyncio.create_task(self._events_not_full.wait()),
+                asyncio.create_task(self._response_tracked.wait()),
+            )
+            try:
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+
+        return True
+
     async def _task(self) -> None:
         async def read_gen() -> AsyncGenerator[str, None]:
-            while await self._ready_to_read.wait() and (data := await self._connection.readline()):
+            while (
+                await self._ready_to_read.wait()
+                and await self._wait_for_event_room()
+                and (data := await self._connection.readline())
+            ):
                 logger.debug("Received data: %r", data)
                 yield data.rstrip()
 
@@ -126,12 +157,10 @@ class Reader:
                     self._response_buffer.put(tuple(read_buffer))
                     read_buffer.clear()
 
-    async def _get_response(self) -> tuple[str, ...]:
-        return await self._response_buffer.pop()
-
-    async def read_response(self) -> tuple[str, ...]:
-        if self._skipped_responses > 0:
-            await self._response_buffer.discard(self._skipped_responses)
-            self._skipped_responses = 0
+    async def read_response(self, response: asyncio.Future[tuple[str, ...]]) -> tuple[str, ...]:
+        """
+        Wait for a tracked response.
 
-        return await asyncio.wait_for(self._get_response(), timeout=self._read_timeout)
+        If the wait times out or is cancelled, the response is discarded once it arrives.
+        """
+        return await asyncio.wait_for(response, timeout=self._read_timeout)
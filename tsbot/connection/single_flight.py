@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """
+    Shares the result of identical calls in flight.
+
+    While a call with a key is running, calls with the same key wait for its result
+    instead of making a call of their own.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Task[_T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._in_flight
+
+    def _done(self, key: str, task: asyncio.Task[_T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Mark the exception retrieved, in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, func: Callable[[], Coroutine[Any, Any, _T]]) -> _T:
+        """
+        Call `func`, or wait for the result of a call in flight with the same `key`.
+
+        Cancelling a caller doesn't cancel the shared call.
+        """
+        if (task := self._in_flight.get(key)) is None:
+            task = asyncio.create_task(func())
+            task.add_done_callback(lambda t: self._done(key, t))
+            self._in_flight[key] = task
+
+        return await asyncio.shield(task)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Generator, Iterable, Sequence
 from typing import TYPE_CHECKING
 
 import tsbot.logging
@@ -14,26 +15,125 @@ logger = tsbot.logging.get_logger(__name__)
 
 
 class Writer:
+    MAX_BATCH_SIZE: int = 100
+
     def __init__(
         self,
         connection: connection.abc.Connection,
         ratelimiter: ratelimiter.RateLimiter | None,
         ready_to_write: asyncio.Event,
         on_send: Callable[[str], None],
+        antiflood: ratelimiter.AntiFloodLimiter | None = None,
     ) -> None:
         self._connection = connection
 
         self._on_send = on_send
 
         self._ratelimiter = ratelimiter
+        self._antiflood = antiflood
         self._ready_to_write = ready_to_write
 
-    async def write(self, raw_query: str) -> None:
+        self._paused_until: float = 0
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_until > time.monotonic()
+
+    @property
+    def batch_size(self) -> int:
+        """Amount of queries written at once with `write_many`."""
+        if self._ratelimiter:
+            return min(self._ratelimiter.burst, self.MAX_BATCH_SIZE)
+
+        return self.MAX_BATCH_SIZE
+
+    def batches(self, raw_queries: Iterable[str]) -> Generator[tuple[str, ...], None, None]:
+        """
+        Split queries into batches written at once with `write_many`.
+
+        Batches have at most :attr:`batch_size` queries, and their total anti-flood cost
+        stays within the points the server allows at once. A single query costing more
+        than that is still written as its own batch.
+        """
+        batch: list[str] = []
+        batch_cost: float = 0
+
+        for raw_query in raw_queries:
+            cost = self._antiflood.cost(raw_query) if self._antiflood else 0
+            budget = self._antiflood.burst if self._antiflood else None
+
+            if batch and budget is not None and batch_cost + cost > budget:
+                yield tuple(batch)
+                batch, batch_cost = [], 0
+
+            batch.append(raw_query)
+            batch_cost += cost
+
+            if len(batch) >= self.batch_size:
+                yield tuple(batch)
+                batch, batch_cost = [], 0
+
+        if batch:
+            yield tuple(batch)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all writes for `seconds`.
+
+        Pausing while already paused extends the pause, if it would end later.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def _wait_for_turn(self) -> None:
         await self._ready_to_write.wait()
 
+        while (pause := self._paused_until - time.monotonic()) > 0:
+            logger.debug("Writing paused, sleeping for %.3fs", pause)
+            await asyncio.sleep(pause)
+
+    async def write(self, raw_query: str, on_write: Callable[[], None] | None = None) -> None:
+        """
+        Write a query to the server.
+
+        `on_write` is called right before the query is handed to the connection.
+        Once called, the server will respond to the query even if the write is cancelled.
+        """
+        await self._wait_for_turn()
+
         if self._ratelimiter:
             await self._ratelimiter.wait()
 
+        if self._antiflood:
+            await self._antiflood.wait(raw_query)
+
+        if on_write:
+            on_write()
+
         logger.debug("Sending data: %r", raw_query)
         await self._connection.write(raw_query)
         self._on_send(raw_query)
+
+    async def write_many(
+        self, raw_queries: Sequence[str], on_write: Callable[[int], None] | None = None
+    ) -> None:
+        """
+        Write multiple queries to the server at once.
+
+        `on_write` is called with the amount of queries right before they are handed to the connection.
+        """
+        await self._wait_for_turn()
+
+        if self._ratelimiter:
+            await self._ratelimiter.wait(len(raw_queries))
+
+        if self._antiflood:
+            await self._antiflood.wait_many(raw_queries)
+
+        if on_write:
+            on_write(len(raw_queries))
+
+        logger.debug("Sending %d queries: %r", len(raw_queries), raw_queries)
+        await self._connection.write_many(raw_queries)
+
+        for raw_query in raw_queries:
+            self._on_send(raw_query)
@@ -31,7 +31,7 @@ class KeepAlive(plugin.TSPlugin):
             bot.remove_task(self._task)
             self._task = None
 
-    @plugin.on("send")
+    @plugin.on("send", eager=True)
     async def on_command_sent(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
         self.command_sent_event.set()
 
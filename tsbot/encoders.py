@@ -16,16 +16,44 @@ ESCAPE_MAP = (
     ("\v", r"\v"),
 )
 
+# Control characters are rare in values, so they are replaced only if the value has any
+_CONTROL_ESCAPES = ESCAPE_MAP[4:]
+
 
 def escape(input_str: str) -> str:
     """Escapes all the characters that need to be escaped."""
-    for char, replacement in ESCAPE_MAP:
-        input_str = input_str.replace(char, replacement)
+    # Ids and numbers have nothing to escape
+    if input_str.isalnum():
+        return input_str
+
+    input_str = (
+        input_str.replace("\\", r"\\").replace("/", r"\/").replace(" ", r"\s").replace("|", r"\p")
+    )
+
+    if not input_str.isprintable():
+        for char, replacement in _CONTROL_ESCAPES:
+            input_str = input_str.replace(char, replacement)
+
+    return input_str
+
+
+def _unescape_part(input_str: str) -> str:
+    input_str = input_str.replace(r"\s", " ").replace(r"\/", "/").replace(r"\p", "|")
+
+    if "\\" in input_str:
+        for char, replacement in _CONTROL_ESCAPES:
+            input_str = input_str.replace(replacement, char)
+
     return input_str
 
 
 def unescape(input_str: str) -> str:
     """Unescape all the special characters sent by the server."""
-    for replacement, char in ESCAPE_MAP:
-        input_str = input_str.replace(char, replacement)
-    return input_str
+    if "\\" not in input_str:
+        return input_str
+
+    # Split on escaped backslashes, so '\\s' isn't read as an escaped space
+    if "\\\\" in input_str:
+        return "\\".join(map(_unescape_part, input_str.split("\\\\")))
+
+    return _unescape_part(input_str)
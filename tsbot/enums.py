@@ -7,3 +7,11 @@ class TextMessageTargetMode(Enum):
     CLIENT = "1"
     CHANNEL = "2"
     SERVER = "3"
+
+
+class QueryPriority(Enum):
+    """Order in which queries waiting to be sent are written to the server."""
+
+    INTERACTIVE = 0  #: Responses to users, eg. command replies.
+    NORMAL = 1  #: Default priority of single queries.
+    BULK = 2  #: Background jobs, eg. batched queries.
@@ -1,5 +1,35 @@
 from tsbot.events.event import TSEvent
-from tsbot.events.event_handler import EventHandler, TSEventHandler, TSEventOnceHandler
+from tsbot.events.event_handler import (
+    CoalesceKey,
+    EventHandler,
+    TSEventCoalescingHandler,
+    TSEventHandler,
+    TSEventOnceHandler,
+)
 from tsbot.events.manager import EventManager
+from tsbot.events.queue import (
+    Block,
+    Coalesce,
+    DropNewest,
+    DropOldest,
+    EventQueue,
+    EventQueueStats,
+    OverflowPolicy,
+)
 
-__all__ = ("EventHandler", "EventManager", "TSEvent", "TSEventHandler", "TSEventOnceHandler")
+__all__ = (
+    "Block",
+    "Coalesce",
+    "CoalesceKey",
+    "DropNewest",
+    "DropOldest",
+    "EventHandler",
+    "EventManager",
+    "EventQueue",
+    "EventQueueStats",
+    "OverflowPolicy",
+    "TSEvent",
+    "TSEventCoalescingHandler",
+    "TSEventHandler",
+    "TSEventOnceHandler",
+)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Mapping
 from typing import Any, NamedTuple
 
 from typing_extensions import Self
@@ -7,6 +8,35 @@ from typing_extensions import Self
 from tsbot import context, parsers
 
 
+class _NotificationCtx(Mapping[str, str]):
+    """Context of a server notification. The notification is parsed on first access."""
+
+    __slots__ = ("_data", "_parsed")
+
+    def __init__(self, data: str) -> None:
+        self._data = data
+        self._parsed: dict[str, str] | None = None
+
+    @property
+    def _values(self) -> dict[str, str]:
+        if self._parsed is None:
+            self._parsed = parsers.parse_line(self._data)
+
+        return self._parsed
+
+    def __getitem__(self, key: str) -> str:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return repr(self._values)
+
+
 class TSEvent(NamedTuple):
     event: str
     ctx: Any = None
@@ -16,10 +46,11 @@ class TSEvent(NamedTuple):
         """
         Creates a TSEvent instance from server notify.
 
-        Will remove the 'notify' from the beginning of the 'event'
+        Will remove the 'notify' from the beginning of the 'event'.
+        The notification data is parsed only once the context is accessed.
         """
         event, _, data = raw_data.partition(" ")
         return cls(
             event=event.removeprefix("notify"),
-            ctx=context.TSCtx(parsers.parse_line(data)),
+            ctx=context.TSCtx(_NotificationCtx(data)),
         )
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
-from collections.abc import Callable, Coroutine
-from dataclasses import dataclass
+from collections.abc import Callable, Coroutine, Hashable, Mapping
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from typing_extensions import override
 
+import tsbot.logging
+
 if TYPE_CHECKING:
     from tsbot import bot, events
 
+logger = tsbot.logging.get_logger(__name__)
+
 _TC = TypeVar("_TC", contravariant=True)
 
 
@@ -20,6 +25,21 @@ EventHandler = Callable[["bot.TSBot", _TC], Coroutine[None, None, None]]
 class TSEventHandler:
     event: str
     handler: EventHandler[Any]
+    eager: bool = field(default=False, kw_only=True)
+    """Start running the handler right away, instead of scheduling it as a task."""
+    filters: Mapping[str, str] | None = field(default=None, kw_only=True)
+    """Values the fields of the event context must have for the handler to run."""
+    predicate: Callable[[Any], bool] | None = field(default=None, kw_only=True)
+    """Function of the event context that must return `True` for the handler to run."""
+
+    def matches(self, ctx: Any) -> bool:
+        """Should the handler run for an event with the context."""
+        if self.filters and (
+            ctx is None or any(ctx.get(key) != value for key, value in self.filters.items())
+        ):
+            return False
+
+        return self.predicate is None or self.predicate(ctx)
 
     async def run(self, bot: bot.TSBot, event: events.TSEvent) -> None:
         await self.handler(bot, event.ctx)
@@ -40,3 +60,82 @@ class TSEventOnceHandler(TSEventHandler):
             self.remove_event_handler_func(self)
 
         await self.handler(bot, event.ctx)
+
+
+CoalesceKey = str | Callable[[Any], Hashable | None]
+"""Field of the event context, or a function of the event context, to coalesce events by."""
+
+
+@dataclass(slots=True)
+class TSEventCoalescingHandler(TSEventHandler):
+    """
+    Event handler that runs only for the newest event per key within a window.
+
+    The first event with a key starts the window. Events with the same key
+    arriving during the window replace the pending event. Once the window ends,
+    the handler is ran with the newest event. Events with key of `None` are not coalesced.
+
+    The window is timed with the event loop, so events don't hold an event worker.
+    """
+
+    key: CoalesceKey
+    window: float
+    _pending: dict[Hashable, events.TSEvent] = field(
+        default_factory=dict[Hashable, "events.TSEvent"]
+    )
+    _timers: dict[Hashable, asyncio.TimerHandle] = field(
+        default_factory=dict[Hashable, asyncio.TimerHandle]
+    )
+    _flushes: set[asyncio.Task[None]] = field(default_factory=set[asyncio.Task[None]])
+
+    @property
+    def pending(self) -> bool:
+        """Are there events waiting for their window to end, or being handled after it."""
+        return bool(self._pending or self._flushes)
+
+    def _get_key(self, ctx: Any) -> Hashable | None:
+        if isinstance(self.key, str):
+            return ctx.get(self.key) if ctx else None
+
+        return self.key(ctx)
+
+    def _flush(self, bot: bot.TSBot, key: Hashable) -> None:
+        del self._timers[key]
+        event = self._pending.pop(key)
+
+        flush = asyncio.create_task(self._run_flush(bot, event), name="CoalescingHandler")
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+
+    async def _run_flush(self, bot: bot.TSBot, event: events.TSEvent) -> None:
+        try:
+            await self.handler(bot, event.ctx)
+        except Exception:
+            logger.exception(
+                "Exception in %r handler %r",
+                event.event,
+                getattr(self.handler, "__name__", self.handler),
+            )
+
+    async def drain(self, bot: bot.TSBot) -> None:
+        """End the windows right away and wait until the pending events are handled."""
+        for key, timer in tuple(self._timers.items()):
+            timer.cancel()
+            self._flush(bot, key)
+
+        await asyncio.gather(*self._flushes)
+
+    @override
+    async def run(self, bot: bot.TSBot, event: events.TSEvent) -> None:
+        if (key := self._get_key(event.ctx)) is None:
+            await self.handler(bot, event.ctx)
+            return
+
+        if key in self._pending:
+            self._pending[key] = event
+            return
+
+        self._pending[key] = event
+        self._timers[key] = asyncio.get_running_loop().call_later(
+            self.window, self._flush, bot, key
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
 from typing import Literal
 
 BUILTIN_NO_CTX_EVENTS = Literal[
@@ -12,6 +13,7 @@ BUILTIN_NO_CTX_EVENTS = Literal[
 
 BUILTIN_EVENTS = Literal[
     "send",
+    "flood",
     "command_error",
     "permission_error",
     "parameter_error",
@@ -31,3 +33,29 @@ TS_EVENTS = Literal[
     "channelpasswordchanged",
     "tokenused",
 ]
+
+NOTIFICATION_EVENTS: Mapping[str, frozenset[str]] = {
+    "server": frozenset(("cliententerview", "clientleftview", "serveredited")),
+    "channel": frozenset(
+        (
+            "clientmoved",
+            "channeledited",
+            "channeldescriptionchanged",
+            "channelcreated",
+            "channeldeleted",
+            "channelmoved",
+            "channelpasswordchanged",
+        )
+    ),
+    "textserver": frozenset(("textmessage",)),
+    "textchannel": frozenset(("textmessage",)),
+    "textprivate": frozenset(("textmessage",)),
+    "tokenused": frozenset(("tokenused",)),
+}
+"""Events sent by the server, by the notification class they are registered with."""
+
+
+def notification_classes(events: Iterable[str]) -> frozenset[str]:
+    """Notification classes needed to receive the given events."""
+    events = set(events)
+    return frozenset(c for c, class_events in NOTIFICATION_EVENTS.items() if class_events & events)
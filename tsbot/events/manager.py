@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import asyncio
 from collections import defaultdict
-from typing import TYPE_CHECKING
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any, cast
 
 import tsbot.logging
 from tsbot import events, utils
+from tsbot.events import queue
 
 if TYPE_CHECKING:
     from tsbot import bot
@@ -13,13 +15,117 @@ if TYPE_CHECKING:
 logger = tsbot.logging.get_logger(__name__)
 
 
-class EventManager:
+class _EventHandlers:
+    """
+    Handlers of an event.
+
+    Handlers with filters are indexed by the value of their first filtered field,
+    so handlers that can't match the event are never looked at.
+    """
+
     def __init__(self) -> None:
-        self._event_handlers: defaultdict[str, list[events.TSEventHandler]] = defaultdict(list)
-        self._event_queue: asyncio.Queue[events.TSEvent] = asyncio.Queue()
+        self._handlers: list[events.TSEventHandler] = []
+        self._unindexed: list[events.TSEventHandler] = []
+        self._index: defaultdict[str, defaultdict[str, list[events.TSEventHandler]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._handlers)
+
+    def __iter__(self) -> Iterator[events.TSEventHandler]:
+        return iter(self._handlers)
+
+    @staticmethod
+    def _index_key(event_handler: events.TSEventHandler) -> tuple[str, str] | None:
+        return next(iter(event_handler.filters.items()), None) if event_handler.filters else None
+
+    def add(self, event_handler: events.TSEventHandler) -> None:
+        self._handlers.append(event_handler)
+
+        if key := self._index_key(event_handler):
+            self._index[key[0]][key[1]].append(event_handler)
+        else:
+            self._unindexed.append(event_handler)
+
+    def remove(self, event_handler: events.TSEventHandler) -> None:
+        self._handlers.remove(event_handler)
+
+        if not (key := self._index_key(event_handler)):
+            self._unindexed.remove(event_handler)
+            return
+
+        field, value = key
+        self._index[field][value].remove(event_handler)
+
+        if not self._index[field][value]:
+            del self._index[field][value]
+        if not self._index[field]:
+            del self._index[field]
+
+    def candidates(self, ctx: Any) -> list[events.TSEventHandler]:
+        """Handlers that aren't ruled out by the index."""
+        if not self._index or not isinstance(ctx, Mapping):
+            return self._unindexed
+
+        fields = cast(Mapping[str, str], ctx)
+        return self._unindexed + [
+            event_handler
+            for field, handlers in self._index.items()
+            if (value := fields.get(field)) is not None
+            for event_handler in handlers.get(value, ())
+        ]
+
+
+class EventManager:
+    """
+    Runs the handlers of the events put into the event queue.
+
+    Events are handled by a fixed amount of workers, each handling one event at a time.
+    The handlers of an event are ran concurrently. Eager handlers start running right away
+    and become tasks only if they suspend.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overflow_policy: queue.OverflowPolicy | None = None,
+        workers: int = 100,
+    ) -> None:
+        """
+        :param maxsize: Maximum amount of events waiting to be handled. Unbounded if less or equal to 0.
+        :param overflow_policy: Policy used when the event queue is full.
+        :param workers: Maximum amount of events handled at once.
+        """  # noqa: D205
+        if workers < 1:
+            raise ValueError("Event manager needs at least one worker")
+
+        self._event_handlers: defaultdict[str, _EventHandlers] = defaultdict(_EventHandlers)
+        self._event_queue = queue.EventQueue(maxsize, overflow_policy)
         self._running = asyncio.Event()
 
+        self._worker_count = workers
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def stats(self) -> queue.EventQueueStats:
+        return self._event_queue.stats
+
+    @property
+    def not_full(self) -> asyncio.Event:
+        """Set while the event queue has room for more events."""
+        return self._event_queue.not_full
+
+    @property
+    def handled_events(self) -> set[str]:
+        """Names of the events with registered handlers."""
+        return {event for event, handlers in self._event_handlers.items() if handlers}
+
     def add_event(self, event: events.TSEvent) -> None:
+        # Events without handlers are dropped before reaching the queue
+        if not self._event_handlers.get(event.event):
+            return
+
         if not self.running:
             logger.warning("Event %r emitted during closing and is ignored", event.event)
         else:
@@ -32,33 +138,113 @@ class EventManager:
     async def await_running(self) -> None:
         await self._running.wait()
 
-    def handle_event(self, bot: bot.TSBot, event: events.TSEvent) -> None:
+    async def _run_handler(
+        self, bot: bot.TSBot, handler: events.TSEventHandler, event: events.TSEvent
+    ) -> None:
+        try:
+            await handler.run(bot, event)
+        except Exception:
+            logger.exception(
+                "Exception in %r handler %r",
+                event.event,
+                getattr(handler.handler, "__name__", handler.handler),
+            )
+
+    def _matches(self, handler: events.TSEventHandler, event: events.TSEvent) -> bool:
+        try:
+            return handler.matches(event.ctx)
+        except Exception:
+            logger.exception(
+                "Exception in %r handler %r filters",
+                event.event,
+                getattr(handler.handler, "__name__", handler.handler),
+            )
+            return False
+
+    async def handle_event(self, bot: bot.TSBot, event: events.TSEvent) -> None:
         logger.debug("Got event: %r", event)
-        handlers = self._event_handlers.get(event.event)
 
-        if not handlers:
-            self._event_queue.task_done()
+        if not (event_handlers := self._event_handlers.get(event.event)):
             return
 
-        tasks = [asyncio.create_task(h.run(bot, event), name="EventHandler") for h in handlers]
-        watcher = asyncio.create_task(asyncio.wait(tasks), name="EventWatcher")
-        watcher.add_done_callback(lambda _: self._event_queue.task_done())
+        match [h for h in event_handlers.candidates(event.ctx) if self._matches(h, event)]:
+            case []:
+                pass
+            case [handler]:
+                await self._run_handler(bot, handler, event)
+            case handlers:
+                await asyncio.gather(
+                    *(
+                        utils.eager_task(self._run_handler(bot, h, event))
+                        if h.eager
+                        else self._run_handler(bot, h, event)
+                        for h in handlers
+                    )
+                )
+
+    async def _worker(self, bot: bot.TSBot) -> None:
+        while True:
+            event = await self._event_queue.get()
+            try:
+                await self.handle_event(bot, event)
+            finally:
+                self._event_queue.task_done()
+
+    def _start_workers(self, bot: bot.TSBot) -> None:
+        if self._workers:
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker(bot), name="EventWorker")
+            for _ in range(self._worker_count)
+        ]
+
+    async def _stop_workers(self) -> None:
+        workers, self._workers = self._workers, []
+
+        for worker in workers:
+            worker.cancel()
+
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def _coalescing_handlers(self) -> list[events.TSEventCoalescingHandler]:
+        return [
+            event_handler
+            for event_handlers in self._event_handlers.values()
+            for event_handler in event_handlers
+            if isinstance(event_handler, events.TSEventCoalescingHandler)
+        ]
 
     async def run_till_empty(self, bot: bot.TSBot) -> None:
-        while not self._event_queue.empty():
-            self.handle_event(bot, self._event_queue.get_nowait())
+        """
+        Handle all the events left in the queue and stop the workers.
 
+        Events waiting in the windows of coalescing handlers are handled right away.
+        """
+        self._start_workers(bot)
         await self._event_queue.join()
 
+        while pending := [h for h in self._coalescing_handlers() if h.pending]:
+            await asyncio.gather(*(event_handler.drain(bot) for event_handler in pending))
+            await self._event_queue.join()
+
+        await self._stop_workers()
+
     async def handle_events_task(self, bot: bot.TSBot) -> None:
-        """Task to run events put into the event queue."""
+        """
+        Task to run events put into the event queue.
+
+        The workers keep running if this task is cancelled,
+        so events being handled are finished in :meth:`run_till_empty`.
+        """
+        self._start_workers(bot)
+
         with utils.set_event(self._running):
-            while True:
-                self.handle_event(bot, await self._event_queue.get())
+            await asyncio.gather(*map(asyncio.shield, self._workers))
 
     def register_event_handler(self, event_handler: events.TSEventHandler) -> None:
         """Registers event handlers that will be called when given event happens."""
-        self._event_handlers[event_handler.event].append(event_handler)
+        self._event_handlers[event_handler.event].add(event_handler)
 
         logger.debug(
             "Registered %r event to execute handler %r",
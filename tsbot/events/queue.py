@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable, Iterator
+from typing import TYPE_CHECKING, NamedTuple, get_args
+
+import tsbot.logging
+from tsbot.events import event_types
+
+if TYPE_CHECKING:
+    from tsbot import events
+
+
+logger = tsbot.logging.get_logger(__name__)
+
+
+PROTECTED_EVENTS = frozenset(get_args(event_types.BUILTIN_NO_CTX_EVENTS))
+"""Events that are queued even if the queue is full."""
+
+
+class EventQueueStats(NamedTuple):
+    queued: int  #: Events waiting to be handled.
+    dropped: int  #: Events dropped because the queue was full.
+    coalesced: int  #: Events replaced by a newer event with the same key.
+
+
+class OverflowPolicy(ABC):
+    """Decides what happens to an event put into a full :class:`EventQueue`."""
+
+    backpressure: bool = False
+    """Stop reading from the server while the queue is full."""
+
+    def key(self, event: events.TSEvent) -> Hashable | None:
+        """
+        Key the queue indexes `event` by, for :meth:`EventQueue.find`.
+
+        Events with key of `None` are not indexed.
+        """
+        return None
+
+    @abstractmethod
+    def overflow(self, queue: EventQueue, event: events.TSEvent) -> None:
+        """
+        Called when `event` is put into a full queue.
+
+        Use :meth:`EventQueue.append`, :meth:`EventQueue.drop` and :meth:`EventQueue.replace`
+        to make room or to drop the event, and :meth:`EventQueue.find` to look up queued events by key.
+        """
+
+
+class DropNewest(OverflowPolicy):
+    """Drop the event being put into the queue."""
+
+    def overflow(self, queue: EventQueue, event: events.TSEvent) -> None:
+        queue.drop(event)
+
+
+class DropOldest(OverflowPolicy):
+    """Drop the oldest event in the queue to make room for the new one."""
+
+    def overflow(self, queue: EventQueue, event: events.TSEvent) -> None:
+        if (oldest := queue.oldest_droppable()) is None:
+            queue.drop(event)
+            return
+
+        queue.drop(oldest)
+        queue.append(event)
+
+
+class Coalesce(OverflowPolicy):
+    """
+    Replace a queued event that has the same key with the new one.
+
+    If no queued event has the same key, `fallback` is used.
+    """
+
+    def __init__(
+        self,
+        key: Callable[[events.TSEvent], Hashable | None],
+        fallback: OverflowPolicy | None = None,
+    ) -> None:
+        """
+        :param key: Function returning the key of an event. Events with key of `None` are not coalesced.
+        :param fallback: Policy used if no event can be coalesced. Defaults to :class:`DropOldest`.
+        """  # noqa: D205
+        self._key = key
+        self._fallback = fallback or DropOldest()
+
+    def key(self, event: events.TSEvent) -> Hashable | None:
+        if (key := self._key(event)) is None:
+            return None
+
+        return event.event, key
+
+    def overflow(self, queue: EventQueue, event: events.TSEvent) -> None:
+        if (key := self.key(event)) is not None and (queued := queue.find(key)) is not None:
+            queue.replace(queued, event)
+            return
+
+        self._fallback.overflow(queue, event)
+
+
+class Block(OverflowPolicy):
+    """
+    Queue the event and stop reading from the server until the queue has room.
+
+    Reading is not stopped while the bot is waiting for responses to queries,
+    so handlers sending queries can't deadlock the bot.
+    """
+
+    backpressure = True
+
+    def overflow(self, queue: EventQueue, event: events.TSEvent) -> None:
+        queue.append(event)
+
+
+class _Entry:
+    """Place of an event in the queue."""
+
+    __slots__ = ("event", "key")
+
+    def __init__(self, event: events.TSEvent, key: Hashable | None) -> None:
+        self.event = event
+        self.key = key
+
+
+class EventQueue:
+    """
+    Queue of events waiting to be handled.
+
+    Works like :class:`asyncio.Queue`, but instead of making the caller wait,
+    putting an event into a full queue is handled by an :class:`OverflowPolicy`.
+    """
+
+    def __init__(self, maxsize: int = 0, overflow_policy: OverflowPolicy | None = None) -> None:
+        """
+        :param maxsize: Maximum amount of events in the queue. Unbounded if less or equal to 0.
+        :param overflow_policy: Policy used when the queue is full. Defaults to :class:`DropOldest`.
+        """  # noqa: D205
+        self._maxsize = maxsize
+        self._policy = overflow_policy or DropOldest()
+
+        self._events: collections.deque[_Entry] = collections.deque()
+        self._keyed: dict[Hashable, _Entry] = {}
+        self._getters: collections.deque[asyncio.Future[None]] = collections.deque()
+
+        self._unfinished = 0
+        self._finished = asyncio.Event()
+        self._finished.set()
+
+        self.not_full = asyncio.Event()
+        """Set while the queue has room. Only cleared if the policy applies backpressure."""
+        self.not_full.set()
+
+        self._dropped = 0
+        self._coalesced = 0
+
+    def __iter__(self) -> Iterator[events.TSEvent]:
+        return iter(tuple(entry.event for entry in self._events))
+
+    @property
+    def stats(self) -> EventQueueStats:
+        return EventQueueStats(
+            queued=len(self._events), dropped=self._dropped, coalesced=self._coalesced
+        )
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+    def empty(self) -> bool:
+        return not self._events
+
+    def full(self) -> bool:
+        return 0 < self._maxsize <= len(self._events)
+
+    def _update_not_full(self) -> None:
+        if not self._policy.backpressure:
+            return
+
+        if self.full():
+            self.not_full.clear()
+        else:
+            self.not_full.set()
+
+    def _wakeup_next(self) -> None:
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
+
+    def _key(self, event: events.TSEvent) -> Hashable | None:
+        return None if event.event in PROTECTED_EVENTS else self._policy.key(event)
+
+    def _index(self, entry: _Entry) -> None:
+        if entry.key is not None:
+            self._keyed[entry.key] = entry
+
+    def _unindex(self, entry: _Entry) -> None:
+        if entry.key is not None and self._keyed.get(entry.key) is entry:
+            del self._keyed[entry.key]
+
+    def _entry(self, event: events.TSEvent) -> _Entry | None:
+        key = self._key(event)
+        if key is not None and (entry := self._keyed.get(key)) and entry.event is event:
+            return entry
+
+        return next((entry for entry in self._events if entry.event is event), None)
+
+    def append(self, event: events.TSEvent) -> None:
+        """Add an event to the end of the queue, even if the queue is full."""
+        entry = _Entry(event, self._key(event))
+        self._events.append(entry)
+        self._index(entry)
+        self._unfinished += 1
+        self._finished.clear()
+        self._update_not_full()
+        self._wakeup_next()
+
+    def drop(self, event: events.TSEvent) -> None:
+        """Drop an event. If the event is in the queue, it is removed from it."""
+        self._dropped += 1
+        logger.debug("Event queue full, dropping %r event", event.event)
+
+        if (entry := self._entry(event)) is None:
+            return
+
+        self._events.remove(entry)
+        self._unindex(entry)
+        self.task_done()
+
+    def replace(self, queued: events.TSEvent, event: events.TSEvent) -> None:
+        """Replace an event in the queue with `event`, keeping its place in the queue."""
+        if (entry := self._entry(queued)) is None:
+            raise ValueError("Replaced event is not in the queue")
+
+        self._unindex(entry)
+        entry.event, entry.key = event, self._key(event)
+        self._index(entry)
+        self._coalesced += 1
+
+    def find(self, key: Hashable) -> events.TSEvent | None:
+        """The newest event in the queue with the key given by the overflow policy."""
+        entry = self._keyed.get(key)
+        return entry.event if entry else None
+
+    def oldest_droppable(self) -> events.TSEvent | None:
+        """The oldest event in the queue that can be dropped."""
+        return next(
+            (entry.event for entry in self._events if entry.event.event not in PROTECTED_EVENTS),
+            None,
+        )
+
+    def put_nowait(self, event: events.TSEvent) -> None:
+        if self.full() and event.event not in PROTECTED_EVENTS:
+            self._policy.overflow(self, event)
+        else:
+            self.append(event)
+
+    def get_nowait(self) -> events.TSEvent:
+        if not self._events:
+            raise asyncio.QueueEmpty
+
+        entry = self._events.popleft()
+        self._unindex(entry)
+        self._update_not_full()
+        return entry.event
+
+    async def get(self) -> events.TSEvent:
+        while not self._events:
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except BaseException:
+                getter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._getters.remove(getter)
+
+                # Pass the wakeup on if this getter was woken up and then cancelled
+                if self._events and not getter.cancelled():
+                    self._wakeup_next()
+                raise
+
+        return self.get_nowait()
+
+    def task_done(self) -> None:
+        """Indicate that an event taken from the queue is handled."""
+        if self._unfinished <= 0:
+            raise ValueError("task_done() called too many times")
+
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._finished.set()
+
+    async def join(self) -> None:
+        """Wait until every event put into the queue is handled."""
+        await self._finished.wait()
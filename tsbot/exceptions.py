@@ -27,6 +27,17 @@ class TSResponsePermissionError(TSResponseError):
         return f"Error {self.error_id}: {self.msg}, failed on permid {self.perm_id}"
 
 
+class TSResponseFloodError(TSResponseError):
+    """Raised when a response has error_id of '524', indicating that the server considers the client to be flooding."""
+
+    def __init__(self, msg: str, error_id: int, retry_after: float) -> None:
+        super().__init__(msg, error_id)
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return f"Error {self.error_id}: {self.msg}, retry after {self.retry_after} seconds"
+
+
 class TSCommandError(TSException):
     """Command handlers can raise this exception to indicate that something went wrong while running the handler."""
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import itertools
+import sys
 from typing import Literal, overload
 
 from tsbot import encoders
@@ -25,6 +26,8 @@ def parse_line(input_str: str) -> dict[str, str]:
 
 def parse_value(input_str: str) -> tuple[str, str]:
     key, _, value = input_str.partition("=")
+    # Rows of a response share the same keys. Interning them keeps one copy of each key
+    key = sys.intern(key)
 
     if not value:
         return key, ""
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Coroutine, Sequence
+from collections.abc import Callable, Coroutine, Mapping, Sequence
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeVar, overload
 
 from typing_extensions import Concatenate, Self  # noqa: UP035
@@ -33,6 +33,14 @@ class EventKwargs(TypedDict):
     event_type: str
 
 
+class OnEventKwargs(EventKwargs):
+    coalesce_key: events.CoalesceKey | None
+    coalesce_window: float
+    eager: bool
+    filters: Mapping[str, str] | None
+    predicate: Callable[[Any], bool] | None
+
+
 COMMAND_ATTR = "__ts_command__"
 EVENT_ATTR = "__ts_event__"
 ONCE_ATTR = "__ts_once__"
@@ -129,38 +137,84 @@ def command(
 @overload
 def on(
     event_type: event_types.BUILTIN_EVENTS,
+    *,
+    coalesce_key: events.CoalesceKey | None = None,
+    coalesce_window: float = 0.2,
+    eager: bool = False,
+    filters: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], bool] | None = None,
 ) -> Callable[[PluginEventHandler[_TP, context.TSCtx]], PluginEventHandler[_TP, context.TSCtx]]: ...
 
 
 @overload
 def on(
     event_type: event_types.BUILTIN_NO_CTX_EVENTS,
+    *,
+    coalesce_key: events.CoalesceKey | None = None,
+    coalesce_window: float = 0.2,
+    eager: bool = False,
+    filters: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], bool] | None = None,
 ) -> Callable[[PluginEventHandler[_TP, None]], PluginEventHandler[_TP, None]]: ...
 
 
 @overload
 def on(
     event_type: event_types.TS_EVENTS,
+    *,
+    coalesce_key: events.CoalesceKey | None = None,
+    coalesce_window: float = 0.2,
+    eager: bool = False,
+    filters: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], bool] | None = None,
 ) -> Callable[[PluginEventHandler[_TP, context.TSCtx]], PluginEventHandler[_TP, context.TSCtx]]: ...
 
 
 @overload
 def on(
     event_type: str,
+    *,
+    coalesce_key: events.CoalesceKey | None = None,
+    coalesce_window: float = 0.2,
+    eager: bool = False,
+    filters: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], bool] | None = None,
 ) -> Callable[[PluginEventHandler[_TP, Any]], PluginEventHandler[_TP, Any]]: ...
 
 
 def on(
     event_type: str,
+    *,
+    coalesce_key: events.CoalesceKey | None = None,
+    coalesce_window: float = 0.2,
+    eager: bool = False,
+    filters: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], bool] | None = None,
 ) -> Callable[[PluginEventHandler[_TP, Any]], PluginEventHandler[_TP, Any]]:
     """
     Decorator to register plugin events.
 
     :param event_type: Name of the event.
+    :param coalesce_key: Context field, or function of the context, to coalesce events by.
+    :param coalesce_window: Seconds to wait for newer events with the same key.
+    :param eager: Start running the handler right away when the event is handled.
+    :param filters: Values the fields of the event context must have for the handler to run.
+    :param predicate: Function of the event context that must return `True` for the handler to run.
     """
 
     def event_decorator(func: PluginEventHandler[_TP, Any]) -> PluginEventHandler[_TP, Any]:
-        setattr(func, EVENT_ATTR, EventKwargs(event_type=event_type))
+        setattr(
+            func,
+            EVENT_ATTR,
+            OnEventKwargs(
+                event_type=event_type,
+                coalesce_key=coalesce_key,
+                coalesce_window=coalesce_window,
+                eager=eager,
+                filters=filters,
+                predicate=predicate,
+            ),
+        )
         return func
 
     return event_decorator
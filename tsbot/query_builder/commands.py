@@ -142,3 +142,73 @@ Commands = Literal[
     "version",
     "whoami",
 ]
+
+
+READ_ONLY_COMMANDS: frozenset[Commands] = frozenset(
+    (
+        "apikeylist",
+        "banlist",
+        "bindinglist",
+        "channelclientpermlist",
+        "channelfind",
+        "channelgroupclientlist",
+        "channelgrouplist",
+        "channelgrouppermlist",
+        "channelinfo",
+        "channellist",
+        "channelpermlist",
+        "clientdbfind",
+        "clientdbinfo",
+        "clientdblist",
+        "clientfind",
+        "clientgetdbidfromuid",
+        "clientgetids",
+        "clientgetnamefromdbid",
+        "clientgetnamefromuid",
+        "clientgetuidfromclid",
+        "clientinfo",
+        "clientlist",
+        "clientpermlist",
+        "complainlist",
+        "custominfo",
+        "customsearch",
+        "ftgetfileinfo",
+        "ftgetfilelist",
+        "ftlist",
+        "hostinfo",
+        "instanceinfo",
+        "logview",
+        "permfind",
+        "permidgetbyname",
+        "permissionlist",
+        "permoverview",
+        "privilegekeylist",
+        "queryloginlist",
+        "servergroupclientlist",
+        "servergrouplist",
+        "servergrouppermlist",
+        "servergroupsbyclientid",
+        "serveridgetbyport",
+        "serverinfo",
+        "serverlist",
+        "serverrequestconnectioninfo",
+        "servertemppasswordlist",
+        "tokenlist",
+        "version",
+    )
+)
+"""
+Commands that only read server state.
+
+Responses to these commands don't depend on the query session they are sent from.
+"""
+
+
+def get_command(raw_query: str) -> str:
+    """Get the command name of a raw query."""
+    return raw_query.partition(" ")[0]
+
+
+def is_read_only(raw_query: str) -> bool:
+    """Check if a raw query only reads server state."""
+    return get_command(raw_query) in READ_ONLY_COMMANDS
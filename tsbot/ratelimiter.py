@@ -2,29 +2,173 @@ from __future__ import annotations
 
 import asyncio
 import time
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple
 
 import tsbot.logging
+from tsbot.query_builder import commands
 
 logger = tsbot.logging.get_logger(__name__)
 
 
+class RateLimiterStats(NamedTuple):
+    tokens: float  #: Calls that can be made right now without waiting.
+    waiting: int  #: Callers currently waiting for their turn.
+    total_wait: float  #: Total time callers have waited, in seconds.
+
+
 class RateLimiter:
-    def __init__(self, max_calls: int, period: float) -> None:
-        self._max_calls: int = max_calls
-        self._period: float = period
+    """
+    Token bucket rate limiter, implemented with the generic cell rate algorithm.
+
+    Allows `max_calls` calls every `period` seconds on average,
+    with up to `burst` calls at once. Callers are let through in the order they started waiting.
+    """
+
+    def __init__(self, max_calls: int, period: float, burst: int | None = None) -> None:
+        """
+        :param max_calls: Calls per period.
+        :param period: Period interval in seconds.
+        :param burst: Maximum amount of calls made at once. Defaults to `max_calls`.
+        """  # noqa: D205
+        if max_calls < 1 or period <= 0:
+            raise ValueError("Rate limiter needs a positive amount of calls per period")
+
+        self._interval: float = period / max_calls
+        self._burst: int = max_calls if burst is None else max(burst, 1)
+
+        # Theoretical arrival time: when the bucket would be full again
+        self._tat: float = time.monotonic()
+
+        self._lock = asyncio.Lock()
+        self._waiting: int = 0
+        self._total_wait: float = 0
+
+    @property
+    def burst(self) -> int:
+        return self._burst
+
+    @property
+    def tokens(self) -> float:
+        """Calls that can be made right now without waiting."""
+        used = max(self._tat - time.monotonic(), 0) / self._interval
+        return max(self._burst - used, 0)
+
+    @property
+    def stats(self) -> RateLimiterStats:
+        return RateLimiterStats(
+            tokens=self.tokens,
+            waiting=self._waiting,
+            total_wait=self._total_wait,
+        )
+
+    def _reserve(self, cost: float) -> float:
+        """Reserve `cost` tokens. Returns the time to wait before they are available."""
+        now = time.monotonic()
+        self._tat = max(self._tat, now) + cost * self._interval
+        return self._tat - self._burst * self._interval - now
+
+    async def wait(self, cost: float = 1) -> None:
+        """
+        Wait until `cost` calls can be made.
+
+        :param cost: Amount of calls to be made.
+        """
+        self._waiting += 1
+        start = time.monotonic()
+
+        try:
+            async with self._lock:
+                if (delay := self._reserve(cost)) <= 0:
+                    return
+
+                logger.debug("Ratelimiting, sleeping for %.3fs", delay)
+
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    # Give the tokens back. The lock guarantees nobody reserved after us.
+                    self._tat -= cost * self._interval
+                    raise
+
+        finally:
+            self._waiting -= 1
+            self._total_wait += time.monotonic() - start
+
+
+class AntiFloodLimiter:
+    """
+    Paces queries by the anti-flood points they cost on the virtual server.
+
+    The server reduces the accumulated points every tick (one second) and blocks
+    commands once enough points are accumulated. Until configured with
+    the servers anti-flood settings, queries are not limited.
+    """
+
+    TICK_PERIOD: float = 1
+
+    def __init__(
+        self,
+        command_costs: Mapping[str, float] | None = None,
+        default_cost: float = 1,
+        headroom: float = 0.9,
+    ) -> None:
+        """
+        :param command_costs: Points each command costs, by the command name.
+        :param default_cost: Points a command not in `command_costs` costs.
+        :param headroom: Fraction of the points needed for a block that can be spent at once.
+        """  # noqa: D205
+        self._command_costs: Mapping[str, float] = command_costs or {}
+        self._default_cost = default_cost
+        self._headroom = headroom
+
+        self._limiter: RateLimiter | None = None
+
+    @property
+    def configured(self) -> bool:
+        return self._limiter is not None
+
+    @property
+    def stats(self) -> RateLimiterStats | None:
+        return self._limiter.stats if self._limiter else None
+
+    @property
+    def burst(self) -> int | None:
+        """Points that can be spent at once, if configured."""
+        return self._limiter.burst if self._limiter else None
+
+    def configure(self, points_tick_reduce: int, points_needed_command_block: int) -> None:
+        """
+        Set the budget from the servers anti-flood settings.
+
+        :param points_tick_reduce: `virtualserver_antiflood_points_tick_reduce` of the server.
+        :param points_needed_command_block: `virtualserver_antiflood_points_needed_command_block` of the server.
+        """
+        if points_tick_reduce <= 0 or points_needed_command_block <= 0:
+            self._limiter = None
+            return
 
-        self._calls: int = 0
-        self._since: float = time.monotonic()
+        self._limiter = RateLimiter(
+            max_calls=points_tick_reduce,
+            period=self.TICK_PERIOD,
+            burst=int(points_needed_command_block * self._headroom),
+        )
 
-    async def wait(self) -> None:
-        remaining = self._period - (time.monotonic() - self._since)
+        logger.debug(
+            "Anti-flood budget set to %d points per tick, %d points at once",
+            points_tick_reduce,
+            self._limiter.burst,
+        )
 
-        if remaining <= 0:
-            self._calls = 0
-            self._since = time.monotonic()
+    def cost(self, raw_query: str) -> float:
+        return self._command_costs.get(commands.get_command(raw_query), self._default_cost)
 
-        self._calls += 1
+    async def wait(self, raw_query: str) -> None:
+        """Wait until the server allows the query to be sent."""
+        if self._limiter:
+            await self._limiter.wait(self.cost(raw_query))
 
-        if self._calls >= self._max_calls:
-            logger.debug("Ratelimiting, sleeping for %ss", remaining)
-            await asyncio.sleep(remaining)
+    async def wait_many(self, raw_queries: Iterable[str]) -> None:
+        """Wait until the server allows all the queries to be sent at once."""
+        if self._limiter:
+            await self._limiter.wait(sum(map(self.cost, raw_queries)))
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from collections.abc import Generator, Sequence
+import sys
+from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from typing import overload
+from typing import TYPE_CHECKING, TypeVar, overload
 
 from typing_extensions import Self
 
-from tsbot import parsers
+from tsbot import columnar, parsers
+
+if TYPE_CHECKING:
+    from tsbot import schemas
+
+_R = TypeVar("_R")
 
 
 @dataclass(slots=True, frozen=True)
@@ -34,6 +40,18 @@ class TSResponse:
         """The last dict from the response data."""
         return self.data[-1]
 
+    def columns(self) -> columnar.TSColumns:
+        """Columnar view of the response data, mapping a field name to its values in every row."""
+        return columnar.TSColumns(self.data)
+
+    def compact(self) -> CompactTSResponse:
+        """Copy of the response storing the rows as values sharing a key table."""
+        return CompactTSResponse.from_rows(self, self.error_id, self.msg)
+
+    def decode(self, schema: schemas.Schema[_R]) -> tuple[_R, ...]:
+        """Decode the response data into typed records."""
+        return schema.decode(self)
+
     @overload
     def get(self, key: str, /) -> str | None: ...
 
@@ -45,14 +63,173 @@ class TSResponse:
         return self.first.get(key, default)
 
     @classmethod
-    def from_server_response(cls, raw_data: Sequence[str]) -> Self:
+    def from_server_response(cls, raw_data: Sequence[str], lazy: bool = False) -> TSResponse:
+        """
+        Parse a response from the lines sent by the server.
+
+        :param raw_data: Lines of the response, ending with the error line.
+        :param lazy: Parse the rows only once they are accessed. See :class:`LazyTSResponse`.
+        """
         response_info = parsers.parse_line(raw_data[-1].removeprefix("error "))
-        data = parsers.parse_data("".join(raw_data[:-1]))
 
         error_id = int(response_info.pop("id"))
         msg = response_info.pop("msg")
 
+        if lazy:
+            return LazyTSResponse("".join(raw_data[:-1]), error_id, msg, response_info or None)
+
+        data = parsers.parse_data("".join(raw_data[:-1]))
+
         if response_info:
             data += (response_info,)
 
         return cls(data=data, error_id=error_id, msg=msg)
+
+
+class LazyTSResponse(TSResponse):
+    """
+    Response that keeps the data as sent by the server and parses rows once they are accessed.
+
+    Reading :attr:`first`, :attr:`last` or a single field parses only the row needed,
+    and iterating parses the rows one at a time. Accessing :attr:`data` parses every row.
+    """
+
+    __slots__ = ("_extra", "_lines", "_rows")
+
+    _extra: dict[str, str] | None
+    _lines: list[str]
+    _rows: list[dict[str, str] | None]
+
+    def __init__(
+        self, raw: str, error_id: int, msg: str, extra: dict[str, str] | None = None
+    ) -> None:
+        """
+        :param raw: Data of the response, rows separated with `|`.
+        :param error_id: Id of the error if any.
+        :param msg: Message of the error if any.
+        :param extra: Additional fields of the error line, added as the last row.
+        """  # noqa: D205
+        lines = raw.split("|") if raw else []
+        if extra is not None:
+            lines.append("")
+
+        object.__setattr__(self, "error_id", error_id)
+        object.__setattr__(self, "msg", msg)
+        object.__setattr__(self, "_extra", extra)
+        object.__setattr__(self, "_lines", lines)
+        object.__setattr__(self, "_rows", [None] * len(lines))
+
+    def _row(self, index: int) -> dict[str, str]:
+        if (row := self._rows[index]) is None:
+            if self._extra is not None and index in (-1, len(self._lines) - 1):
+                row = self._extra
+            else:
+                row = parsers.parse_line(self._lines[index])
+
+            self._rows[index] = row
+
+        return row
+
+    @property
+    def data(self) -> tuple[dict[str, str], ...]:  # pyright: ignore[reportIncompatibleVariableOverride]
+        return tuple(self)
+
+    def __iter__(self) -> Generator[dict[str, str], None, None]:
+        yield from map(self._row, range(len(self._lines)))
+
+    @property
+    def first(self) -> dict[str, str]:
+        return self._row(0)
+
+    @property
+    def last(self) -> dict[str, str]:
+        return self._row(-1)
+
+
+class _KeyTable:
+    """Keys shared by the rows with the same fields in the same order."""
+
+    __slots__ = ("index", "keys")
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        self.keys = tuple(map(sys.intern, keys))
+        self.index = {key: i for i, key in enumerate(self.keys)}
+
+
+class CompactRow(Mapping[str, str]):
+    """Read-only row of a :class:`CompactTSResponse`. Stores only the values of the row."""
+
+    __slots__ = ("_table", "_values")
+
+    def __init__(self, table: _KeyTable, values: tuple[str, ...]) -> None:
+        self._table = table
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        return self._values[self._table.index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._table.index
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class CompactTSResponse(TSResponse):
+    """
+    Response storing the rows compactly, for keeping responses around for a long time.
+
+    Rows with the same fields share one table of keys and store only a tuple of their values.
+    Rows are read-only :class:`~collections.abc.Mapping` views instead of dicts.
+    """
+
+    __slots__ = ("_rows",)
+
+    _rows: tuple[CompactRow, ...]
+
+    def __init__(self, rows: tuple[CompactRow, ...], error_id: int, msg: str) -> None:
+        """
+        :param rows: Rows of the response.
+        :param error_id: Id of the error if any.
+        :param msg: Message of the error if any.
+        """  # noqa: D205
+        object.__setattr__(self, "error_id", error_id)
+        object.__setattr__(self, "msg", msg)
+        object.__setattr__(self, "_rows", rows)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, str]], error_id: int, msg: str) -> Self:
+        tables: dict[tuple[str, ...], _KeyTable] = {}
+
+        def compact_row(row: Mapping[str, str]) -> CompactRow:
+            keys = tuple(row)
+            if (table := tables.get(keys)) is None:
+                table = tables[keys] = _KeyTable(keys)
+
+            return CompactRow(table, tuple(row.values()))
+
+        return cls(tuple(map(compact_row, rows)), error_id, msg)
+
+    @property
+    def data(self) -> tuple[CompactRow, ...]:  # pyright: ignore[reportIncompatibleVariableOverride]
+        return self._rows
+
+    def __iter__(self) -> Generator[CompactRow, None, None]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        yield from self._rows
+
+    @property
+    def first(self) -> CompactRow:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._rows[0]
+
+    @property
+    def last(self) -> CompactRow:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return self._rows[-1]
+
+    def compact(self) -> Self:
+        return self
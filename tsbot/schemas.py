@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import types
+import typing
+from collections.abc import Callable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeVar
+
+if TYPE_CHECKING:
+    from tsbot import response
+
+_R = TypeVar("_R")
+
+_REQUIRED: Any = object()
+
+Converter = Callable[[str], Any]
+
+
+def _to_bool(value: str) -> bool:
+    return value == "1"
+
+
+def _tuple_converter(item: Converter) -> Converter:
+    def convert(value: str) -> tuple[Any, ...]:
+        return tuple(map(item, value.split(","))) if value else ()
+
+    return convert
+
+
+def _optional_converter(inner: Converter) -> Converter:
+    def convert(value: str) -> Any:
+        return inner(value) if value else None
+
+    return convert
+
+
+def _converter(field_type: Any) -> Converter:
+    """Compile a function converting a value sent by the server to `field_type`."""
+    if field_type is str:
+        return str
+
+    if field_type is bool:
+        return _to_bool
+
+    if field_type in (int, float):
+        return field_type
+
+    origin, args = typing.get_origin(field_type), typing.get_args(field_type)
+
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return _tuple_converter(_converter(args[0]))
+
+    if origin in (typing.Union, types.UnionType) and type(None) in args:
+        (inner,) = (arg for arg in args if arg is not type(None))
+        return _optional_converter(_converter(inner))
+
+    raise TypeError(f"Unsupported field type {field_type!r}")
+
+
+class Schema(Generic[_R]):
+    """
+    Decodes response rows into typed records.
+
+    The fields of the record and their types are read from the annotations of `record`,
+    usually a :class:`~typing.NamedTuple`. Converters for the fields are compiled once,
+    when the schema is created.
+
+    Supported field types are `str`, `int`, `float`, `bool`, `tuple[T, ...]` of comma separated
+    values and optional types, which are `None` if the value is empty.
+    Fields missing from a row get the default value of the record field.
+    """
+
+    def __init__(self, record: Callable[..., _R]) -> None:
+        """:param record: Class of the records. Its field names are the field names in the response."""
+        self._record = record
+
+        defaults: Mapping[str, Any] = getattr(record, "_field_defaults", {})
+        self._fields = tuple(
+            (name, _converter(field_type), defaults.get(name, _REQUIRED))
+            for name, field_type in typing.get_type_hints(record).items()
+        )
+
+    def decode_row(self, row: Mapping[str, str]) -> _R:
+        """Decode a single response row into a record."""
+        values: list[Any] = []
+
+        for name, convert, default in self._fields:
+            if (value := row.get(name)) is not None:
+                values.append(convert(value))
+            elif default is not _REQUIRED:
+                values.append(default)
+            else:
+                raise KeyError(f"Response row is missing field {name!r}")
+
+        return self._record(*values)
+
+    def decode_rows(self, rows: Iterable[Mapping[str, str]]) -> tuple[_R, ...]:
+        return tuple(map(self.decode_row, rows))
+
+    def decode(self, resp: response.TSResponse) -> tuple[_R, ...]:
+        """Decode all the rows of a response into records."""
+        return self.decode_rows(resp)
+
+
+class ClientListEntry(NamedTuple):
+    """Row of `clientlist`. Fields other than the basic ones are only present with their options."""
+
+    clid: int
+    cid: int
+    client_database_id: int
+    client_nickname: str
+    client_type: int
+    client_unique_identifier: str | None = None  # -uid
+    client_away: bool | None = None  # -away
+    client_away_message: str | None = None  # -away
+    client_flag_talking: bool | None = None  # -voice
+    client_input_muted: bool | None = None  # -voice
+    client_output_muted: bool | None = None  # -voice
+    client_is_recording: bool | None = None  # -voice
+    client_talk_power: int | None = None  # -voice
+    client_idle_time: int | None = None  # -times
+    client_created: int | None = None  # -times
+    client_lastconnected: int | None = None  # -times
+    client_servergroups: tuple[int, ...] = ()  # -groups
+    client_channel_group_id: int | None = None  # -groups
+    client_version: str | None = None  # -info
+    client_platform: str | None = None  # -info
+    client_country: str | None = None  # -country
+    connection_client_ip: str | None = None  # -ip
+
+
+class ChannelListEntry(NamedTuple):
+    """Row of `channellist`. Fields other than the basic ones are only present with their options."""
+
+    cid: int
+    pid: int
+    channel_order: int
+    channel_name: str
+    total_clients: int
+    channel_needed_subscribe_power: int
+    channel_topic: str | None = None  # -topic
+    channel_flag_default: bool | None = None  # -flags
+    channel_flag_password: bool | None = None  # -flags
+    channel_flag_permanent: bool | None = None  # -flags
+    channel_flag_semi_permanent: bool | None = None  # -flags
+    channel_codec: int | None = None  # -voice
+    channel_codec_quality: int | None = None  # -voice
+    channel_needed_talk_power: int | None = None  # -voice
+    channel_maxclients: int | None = None  # -limits
+    channel_maxfamilyclients: int | None = None  # -limits
+    total_clients_family: int | None = None  # -limits
+    channel_icon_id: int | None = None  # -icon
+    seconds_empty: int | None = None  # -secondsempty
+
+
+class ServerInfo(NamedTuple):
+    """Commonly used fields of `serverinfo`."""
+
+    virtualserver_id: int
+    virtualserver_unique_identifier: str
+    virtualserver_name: str
+    virtualserver_port: int
+    virtualserver_platform: str
+    virtualserver_version: str
+    virtualserver_status: str
+    virtualserver_uptime: int
+    virtualserver_maxclients: int
+    virtualserver_clientsonline: int
+    virtualserver_queryclientsonline: int
+    virtualserver_channelsonline: int
+    virtualserver_welcomemessage: str = ""
+    virtualserver_default_server_group: int | None = None
+    virtualserver_default_channel_group: int | None = None
+    virtualserver_antiflood_points_tick_reduce: int | None = None
+    virtualserver_antiflood_points_needed_command_block: int | None = None
+    virtualserver_antiflood_points_needed_ip_block: int | None = None
+
+
+CLIENT_LIST = Schema(ClientListEntry)
+CHANNEL_LIST = Schema(ChannelListEntry)
+SERVER_INFO = Schema(ServerInfo)
+
+SCHEMAS: Mapping[str, Schema[Any]] = {
+    "clientlist": CLIENT_LIST,
+    "channellist": CHANNEL_LIST,
+    "serverinfo": SERVER_INFO,
+}
+"""Schemas of the responses by the command name."""
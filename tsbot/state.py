@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import types
+from collections.abc import Callable, Generator, Mapping
+from typing import TYPE_CHECKING
+
+from typing_extensions import override
+
+import tsbot.logging
+from tsbot import exceptions, plugin, query_builder
+
+if TYPE_CHECKING:
+    from tsbot import bot, context, tasks
+
+
+logger = tsbot.logging.get_logger(__name__)
+
+
+_EVENT_ONLY_KEYS = frozenset(
+    ("cfid", "ctid", "cpid", "reasonid", "reasonmsg", "invokerid", "invokername", "invokeruid")
+)
+
+
+def _state_fields(ctx: context.TSCtx) -> dict[str, str]:
+    """Fields of a notification that describe the client or channel itself."""
+    return {k: v for k, v in ctx.items() if k not in _EVENT_ONLY_KEYS}
+
+
+def _clids(ctx: context.TSCtx) -> list[str]:
+    """Client ids of a notification. Notifications about several clients have them comma separated."""
+    return ctx["clid"].split(",")
+
+
+class _Index:
+    """Client ids by the value of a client field."""
+
+    def __init__(self, field: str, key: Callable[[str], str] | None = None) -> None:
+        self._field = field
+        self._key = key
+        self._clids: collections.defaultdict[str, set[str]] = collections.defaultdict(set)
+
+    def _value(self, client: Mapping[str, str]) -> str | None:
+        if (value := client.get(self._field)) is None:
+            return None
+
+        return self._key(value) if self._key else value
+
+    def get(self, value: str) -> tuple[str, ...]:
+        """Snapshot of the client ids, so the index can change while they are iterated."""
+        if self._key:
+            value = self._key(value)
+
+        return tuple(self._clids.get(value, ()))
+
+    def add(self, client: Mapping[str, str]) -> None:
+        if (value := self._value(client)) is not None:
+            self._clids[value].add(client["clid"])
+
+    def discard(self, client: Mapping[str, str]) -> None:
+        if (value := self._value(client)) is None or not (clids := self._clids.get(value)):
+            return
+
+        clids.discard(client["clid"])
+        if not clids:
+            del self._clids[value]
+
+    def clear(self) -> None:
+        self._clids.clear()
+
+
+class ServerState(plugin.TSPlugin):
+    """
+    Mirror of the clients and channels on the virtual server.
+
+    Once the bot connects, the clients and channels are read from the server.
+    After that, the mirror is kept up to date from the server notifications,
+    so reading it doesn't cost any queries.
+
+    The mirror is periodically compared against the server, to catch changes
+    the server doesn't send notifications about.
+
+    Clients can be looked up by their unique identifier, database id,
+    nickname and channel without going through all the clients.
+
+    Clients have the fields returned by `clientlist -uid -groups` and channels
+    have the fields returned by `channellist`.
+    """
+
+    CLIENT_LIST_QUERY = query_builder.TSQuery("clientlist").option("uid", "groups")
+    CHANNEL_LIST_QUERY = query_builder.TSQuery("channellist")
+
+    def __init__(self, reconcile_interval: float = 5 * 60) -> None:
+        """:param reconcile_interval: Seconds between comparing the mirror against the server."""
+        self.reconcile_interval = reconcile_interval
+
+        self._clients: dict[str, dict[str, str]] = {}
+        self._channels: dict[str, dict[str, str]] = {}
+
+        self._by_uid = _Index("client_unique_identifier")
+        self._by_dbid = _Index("client_database_id")
+        self._by_channel = _Index("cid")
+        self._by_nickname = _Index("client_nickname", key=str.casefold)
+        self._indexes = (self._by_uid, self._by_dbid, self._by_channel, self._by_nickname)
+
+        self._synced = asyncio.Event()
+        self._sync_lock = asyncio.Lock()
+        self._missed: list[tuple[Callable[[context.TSCtx], None], context.TSCtx]] | None = None
+
+        self._task: tasks.TSTask | None = None
+
+    @property
+    def synced(self) -> bool:
+        """Is the mirror populated from the server."""
+        return self._synced.is_set()
+
+    async def wait_synced(self) -> None:
+        """Awaits until the mirror is populated from the server."""
+        await self._synced.wait()
+
+    @property
+    def clients(self) -> Mapping[str, Mapping[str, str]]:
+        """Clients on the server by their client id."""
+        return types.MappingProxyType(self._clients)
+
+    @property
+    def channels(self) -> Mapping[str, Mapping[str, str]]:
+        """Channels on the server by their channel id."""
+        return types.MappingProxyType(self._channels)
+
+    def get_client(self, clid: str) -> Mapping[str, str] | None:
+        return self._clients.get(clid)
+
+    def get_channel(self, cid: str) -> Mapping[str, str] | None:
+        return self._channels.get(cid)
+
+    def _clients_by(self, index: _Index, value: str) -> Generator[Mapping[str, str], None, None]:
+        for clid in index.get(value):
+            # Clients that left while iterating are skipped
+            if (client := self._clients.get(clid)) is not None:
+                yield client
+
+    def client_by_uid(self, uid: str) -> Mapping[str, str] | None:
+        """
+        Client with the unique identifier.
+
+        If the same identity is connected multiple times, any of the clients is returned.
+        """
+        return next(self._clients_by(self._by_uid, uid), None)
+
+    def client_by_dbid(self, cldbid: str) -> Mapping[str, str] | None:
+        """
+        Client with the database id.
+
+        If the same identity is connected multiple times, any of the clients is returned.
+        """
+        return next(self._clients_by(self._by_dbid, cldbid), None)
+
+    def clients_by_uid(self, uid: str) -> Generator[Mapping[str, str], None, None]:
+        """All the clients connected with the unique identifier."""
+        yield from self._clients_by(self._by_uid, uid)
+
+    def clients_by_nickname(self, nickname: str) -> Generator[Mapping[str, str], None, None]:
+        """Clients with the nickname, ignoring case."""
+        yield from self._clients_by(self._by_nickname, nickname)
+
+    def channel_clients(self, cid: str) -> Generator[Mapping[str, str], None, None]:
+        """Clients in the channel."""
+        yield from self._clients_by(self._by_channel, cid)
+
+    def _add_client(self, client: dict[str, str]) -> None:
+        self._remove_client(client["clid"])
+        self._clients[client["clid"]] = client
+
+        for index in self._indexes:
+            index.add(client)
+
+    def _remove_client(self, clid: str) -> dict[str, str] | None:
+        if client := self._clients.pop(clid, None):
+            for index in self._indexes:
+                index.discard(client)
+
+        return client
+
+    async def sync(self, bot: bot.TSBot) -> None:
+        """
+        Read the clients and channels from the server.
+
+        Notifications received while reading are applied on top of the read state.
+        """
+        async with self._sync_lock:
+            self._missed = []
+
+            try:
+                clients, channels = await bot.send_many(
+                    (self.CLIENT_LIST_QUERY, self.CHANNEL_LIST_QUERY)
+                )
+
+                self._clients.clear()
+                for index in self._indexes:
+                    index.clear()
+
+                for client in clients:
+                    self._add_client(dict(client))
+
+                self._channels = {c["cid"]: dict(c) for c in channels}
+
+                for apply, ctx in self._missed:
+                    apply(ctx)
+
+            finally:
+                self._missed = None
+
+        self._synced.set()
+        logger.debug(
+            "Server state synced, %d clients in %d channels",
+            len(self._clients),
+            len(self._channels),
+        )
+
+    def _apply(self, apply: Callable[[context.TSCtx], None], ctx: context.TSCtx) -> None:
+        if self._missed is not None:
+            self._missed.append((apply, ctx))
+
+        apply(ctx)
+
+    async def _reconcile(self, bot: bot.TSBot) -> None:
+        try:
+            await self.sync(bot)
+        except (exceptions.TSResponseError, asyncio.TimeoutError) as e:
+            logger.warning("Failed to sync server state: %s", e)
+
+    @plugin.on("connect")
+    async def on_connect(self, bot: bot.TSBot, ctx: None) -> None:
+        await self._reconcile(bot)
+        self._task = bot.register_every_task(
+            self.reconcile_interval, self._reconcile, name="ServerState-Task"
+        )
+
+    def _remove_task(self, bot: bot.TSBot) -> None:
+        if self._task:
+            bot.remove_task(self._task)
+            self._task = None
+
+    @plugin.on("disconnect")
+    async def on_disconnect(self, bot: bot.TSBot, ctx: None) -> None:
+        self._remove_task(bot)
+        self._synced.clear()
+
+    @override
+    def on_unload(self, bot: bot.TSBot) -> None:
+        self._remove_task(bot)
+
+    def _client_entered(self, ctx: context.TSCtx) -> None:
+        self._add_client(_state_fields(ctx) | {"cid": ctx["ctid"]})
+
+    def _client_left(self, ctx: context.TSCtx) -> None:
+        for clid in _clids(ctx):
+            self._remove_client(clid)
+
+    def _client_moved(self, ctx: context.TSCtx) -> None:
+        for clid in _clids(ctx):
+            if client := self._clients.get(clid):
+                self._by_channel.discard(client)
+                client["cid"] = ctx["ctid"]
+                self._by_channel.add(client)
+
+    def _channel_created(self, ctx: context.TSCtx) -> None:
+        self._channels[ctx["cid"]] = _state_fields(ctx) | {"pid": ctx.get("cpid", "0")}
+
+    def _channel_edited(self, ctx: context.TSCtx) -> None:
+        if channel := self._channels.get(ctx["cid"]):
+            channel.update(_state_fields(ctx))
+
+    def _channel_moved(self, ctx: context.TSCtx) -> None:
+        if channel := self._channels.get(ctx["cid"]):
+            channel["pid"] = ctx["cpid"]
+            channel["channel_order"] = ctx["order"]
+
+    def _channel_deleted(self, ctx: context.TSCtx) -> None:
+        self._channels.pop(ctx["cid"], None)
+
+    @plugin.on("cliententerview")
+    async def on_client_enter(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._client_entered, ctx)
+
+    @plugin.on("clientleftview")
+    async def on_client_left(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._client_left, ctx)
+
+    @plugin.on("clientmoved")
+    async def on_client_moved(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._client_moved, ctx)
+
+    @plugin.on("channelcreated")
+    async def on_channel_created(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._channel_created, ctx)
+
+    @plugin.on("channeledited")
+    async def on_channel_edited(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._channel_edited, ctx)
+
+    @plugin.on("channelmoved")
+    async def on_channel_moved(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._channel_moved, ctx)
+
+    @plugin.on("channeldeleted")
+    async def on_channel_deleted(self, bot: bot.TSBot, ctx: context.TSCtx) -> None:
+        self._apply(self._channel_deleted, ctx)
@@ -3,8 +3,12 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import sys
 import time
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Coroutine, Generator
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
 
 
 @contextlib.asynccontextmanager
@@ -28,3 +32,100 @@ def set_event(event: asyncio.Event) -> Generator[None, None, None]:
         yield
     finally:
         event.clear()
+
+
+class _FirstStep:
+    """First step of a coroutine, ran before the task driving it gets to run."""
+
+    __slots__ = ("coro", "done", "exception", "result", "yielded")
+
+    def __init__(self, coro: Coroutine[Any, Any, Any]) -> None:
+        self.coro = coro
+        self.done = False
+        self.result: Any = None
+        self.exception: BaseException | None = None
+        self.yielded: Any = None
+
+    def run(self) -> None:
+        try:
+            self.yielded = self.coro.send(None)
+        except StopIteration as stop:
+            self.done, self.result = True, stop.value
+        except (Exception, asyncio.CancelledError) as e:
+            self.done, self.exception = True, e
+
+
+class _Resume:
+    """Awaitable driving a coroutine that was already stepped outside of a task."""
+
+    __slots__ = ("_coro", "_yielded")
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], yielded: Any) -> None:
+        self._coro = coro
+        self._yielded = yielded
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        yielded = self._yielded
+
+        while True:
+            try:
+                try:
+                    sent = yield yielded
+                except GeneratorExit:
+                    self._coro.close()
+                    raise
+                except BaseException as e:
+                    yielded = self._coro.throw(e)
+                else:
+                    yielded = self._coro.send(sent)
+            except StopIteration as stop:
+                return stop.value
+
+
+async def _resume(first_step: _FirstStep) -> Any:
+    return await _Resume(first_step.coro, first_step.yielded)
+
+
+def eager_task(coro: Coroutine[Any, Any, _T], name: str | None = None) -> asyncio.Future[_T]:
+    """
+    Start running `coro` right away, instead of on the next iteration of the event loop.
+
+    If the coroutine finishes without suspending, a finished future with the result is returned.
+    Otherwise the coroutine continues in a task, which is also the current task
+    during the first step, so timeouts and other task bound state belong to it.
+    """
+    loop = asyncio.get_running_loop()
+
+    if sys.version_info >= (3, 12):
+        return asyncio.eager_task_factory(loop, coro, name=name)
+
+    first_step = _FirstStep(coro)
+    task: asyncio.Task[_T] = loop.create_task(_resume(first_step), name=name)
+
+    # Step the coroutine as the new task, like the eager task factory of Python 3.12
+    current = asyncio.current_task(loop)
+    if current:
+        asyncio.tasks._leave_task(loop, current)  # pyright: ignore[reportPrivateUsage]
+    asyncio.tasks._enter_task(loop, task)  # pyright: ignore[reportPrivateUsage]
+    try:
+        first_step.run()
+    finally:
+        asyncio.tasks._leave_task(loop, task)  # pyright: ignore[reportPrivateUsage]
+        if current:
+            asyncio.tasks._enter_task(loop, current)  # pyright: ignore[reportPrivateUsage]
+
+    if not first_step.done:
+        return task
+
+    # The task never gets to run, so it is cancelled before its first step
+    task.cancel()
+
+    future: asyncio.Future[_T] = loop.create_future()
+    if isinstance(first_step.exception, asyncio.CancelledError):
+        future.cancel()
+    elif first_step.exception:
+        future.set_exception(first_step.exception)
+    else:
+        future.set_result(first_step.result)
+
+    return future